@@ -1,63 +1,124 @@
 from copy import deepcopy
-import pygame
-from checkers.constants import RED, WHITE, SQUARE_SIZE, GREEN, WIDTH, HEIGHT  # Import from checkers.constants
+from checkers.constants import RED, WHITE  # Import from checkers.constants
+from checkers.tablebase import probe_score
+from algorithm.transposition import EXACT, LOWER, UPPER, tt_key
+from algorithm.move_ordering import MoveOrderer
+
+def alpha_beta_pruning(position, depth, max_player, game, alpha=float('-inf'), beta=float('inf'), tt=None, orderer=None, progress=None):
+    if tt is None and game is not None:
+        tt = game.tt  # Results are kept across moves of the same game
+    if orderer is None:
+        orderer = MoveOrderer()
+    if progress is not None:
+        progress.depth = depth
+    evaluation, best_move = search(position, depth, max_player, progress, alpha, beta, tt, orderer)
+    return evaluation, simulate_move(position, best_move)
+
+def search(position, depth, max_player, progress, alpha, beta, tt=None, orderer=None, ply=0):
+    # Searches in place with make/unmake and returns (evaluation, best move)
+    if progress is not None:
+        progress.node()
+    if ply > 0:
+        # A repetition or the move-count rule ends the game in a draw
+        if position.is_draw():
+            return 0, None
+        # Positions in the endgame tablebase have an exact score
+        evaluation = probe_score(position, WHITE if max_player else RED)
+        if evaluation is not None:
+            return evaluation, None
+    tt_move = key = None
+    if tt is not None:
+        key = tt_key(position, WHITE if max_player else RED)
+        entry = tt.probe(key)
+        if entry is not None:
+            tt_move = entry.move
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.score, entry.move
+                if entry.flag == LOWER:
+                    alpha = max(alpha, entry.score)
+                else:
+                    beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return entry.score, entry.move
+    alpha_orig, beta_orig = alpha, beta
 
-def alpha_beta_pruning(position, depth, max_player, game, alpha=float('-inf'), beta=float('inf')):
     if depth == 0 or position.winner() is not None:
-        return position.evaluate(), position
+        evaluation = position.evaluate()
+        if tt is not None:
+            tt.store(key, depth, evaluation, EXACT)
+        return evaluation, None
 
     if max_player:
         maxEval = float('-inf')
         best_move = None
-        moves = get_all_moves(position, WHITE, game)
+        moves = get_all_moves(position, WHITE, orderer, ply, tt_move)
         if not moves:  # No moves available
-            return position.evaluate(), position
+            return position.evaluate(), None
         for move in moves:
-            evaluation = alpha_beta_pruning(move, depth - 1, False, game, alpha, beta)[0]
-            maxEval = max(maxEval, evaluation)
-            alpha = max(alpha, maxEval)  # Update alpha
-            if maxEval == evaluation:
+            token = position.make_move(move)
+            evaluation = search(position, depth - 1, False, progress, alpha, beta, tt, orderer, ply + 1)[0]
+            position.unmake_move(token)
+            # Only a strictly better score replaces the best move: a later move that
+            # failed low can return exactly alpha without being as good
+            if evaluation > maxEval:
+                maxEval = evaluation
                 best_move = move
+                if ply == 0 and progress is not None:
+                    progress.best_move = move
+            alpha = max(alpha, maxEval)  # Update alpha
             if beta <= alpha:  # Prune the branch
+                if orderer is not None:
+                    orderer.cutoff(move, ply, depth)
                 break
+        store(tt, key, depth, maxEval, best_move, alpha_orig, beta_orig)
         return maxEval, best_move
     else:
         minEval = float('inf')
         best_move = None
-        moves = get_all_moves(position, RED, game)
+        moves = get_all_moves(position, RED, orderer, ply, tt_move)
         if not moves:  # No moves available
-            return position.evaluate(), position
+            return position.evaluate(), None
         for move in moves:
-            evaluation = alpha_beta_pruning(move, depth - 1, True, game, alpha, beta)[0]
-            minEval = min(minEval, evaluation)
-            beta = min(beta, minEval)  # Update beta
-            if minEval == evaluation:
+            token = position.make_move(move)
+            evaluation = search(position, depth - 1, True, progress, alpha, beta, tt, orderer, ply + 1)[0]
+            position.unmake_move(token)
+            if evaluation < minEval:
+                minEval = evaluation
                 best_move = move
+                if ply == 0 and progress is not None:
+                    progress.best_move = move
+            beta = min(beta, minEval)  # Update beta
             if beta <= alpha:  # Prune the branch
+                if orderer is not None:
+                    orderer.cutoff(move, ply, depth)
                 break
+        store(tt, key, depth, minEval, best_move, alpha_orig, beta_orig)
         return minEval, best_move
 
-def simulate_move(piece, move, board, game, skip):
-    board.move(piece, move[0], move[1])
-    if skip:
-        board.remove(skip)
-    return board
-
-def get_all_moves(board, color, game):
-    moves = []
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)
-        for move, skip in valid_moves.items():
-            draw_moves(game, board)
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, game, skip)
-            moves.append(new_board)
+def store(tt, key, depth, evaluation, best_move, alpha, beta):
+    # Record whether the score is exact or only a bound of the search window
+    if tt is None:
+        return
+    if evaluation <= alpha:
+        flag = UPPER
+    elif evaluation >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    tt.store(key, depth, evaluation, flag, best_move)
+
+def simulate_move(board, move):
+    # Board after the chosen move; the searched board itself is left untouched
+    if move is None:
+        return board
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
+
+def get_all_moves(board, color, orderer=None, ply=0, tt_move=None):
+    moves = board.legal_moves(color)
+    if orderer is not None:
+        moves = orderer.order(moves, ply, tt_move)
     return moves
 
-def draw_moves(game, board):  # Fixed parameter to match get_all_moves call
-    font = pygame.font.Font(None, SQUARE_SIZE // 2)  # Scale font size with SQUARE_SIZE
-    text = font.render("Thinking", True, GREEN)  # Use GREEN from constants
-    text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))  # Center for current window size
-    game.win.blit(text, text_rect)
-    pygame.display.update()
\ No newline at end of file
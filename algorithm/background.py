@@ -0,0 +1,38 @@
+import threading
+from copy import deepcopy
+from algorithm.progress import SearchProgress, SearchCancelled
+
+class BackgroundSearch:
+    """
+    Runs one AI search on a worker thread so the caller's event loop keeps
+    running. The search works on its own copy of the board and reports
+    through self.progress; poll done() and read result once it is True.
+    """
+    def __init__(self, search, board, *args, **kwargs):
+        self.progress = SearchProgress()
+        self.result = None
+        self.error = None
+        kwargs["progress"] = self.progress
+        self._thread = threading.Thread(target=self._run, args=(search, deepcopy(board)) + args,
+                                        kwargs=kwargs, daemon=True)
+        self._thread.start()
+
+    def _run(self, search, board, *args, **kwargs):
+        try:
+            self.result = search(board, *args, **kwargs)
+        except SearchCancelled:
+            pass
+        except Exception as error:  # Re-raised on the caller's thread by done()
+            self.error = error
+
+    def done(self):
+        if self._thread.is_alive():
+            return False
+        if self.error is not None:
+            raise self.error
+        return not self.progress.cancelled
+
+    def cancel(self):
+        # Stop the search at its next node and wait for the thread to finish
+        self.progress.cancel()
+        self._thread.join()
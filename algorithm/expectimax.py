@@ -1,9 +1,19 @@
 from copy import deepcopy
-import pygame
-from checkers.constants import RED, WHITE, SQUARE_SIZE, GREEN, WIDTH, HEIGHT
+from checkers.constants import RED, WHITE
 from random import random
 
-def expectimax(position, depth, max_player, game):
+def expectimax(position, depth, max_player, game, progress=None):
+    if progress is not None:
+        progress.depth = depth
+    evaluation, best_move = search(position, depth, max_player, progress)
+    return evaluation, simulate_move(position, best_move)
+
+def search(position, depth, max_player, progress=None):
+    # Searches in place with make/unmake and returns (evaluation, best move)
+    if progress is not None:
+        progress.node()
+    if position.is_draw():  # A repetition or the move-count rule ends the game in a draw
+        return 0, None
     
     wrong_eval = 9999                   # Winning eval is 10,000
     # Setting this high but below 10,000 means even random behavior will not stop a winning move
@@ -21,9 +31,9 @@ def expectimax(position, depth, max_player, game):
     
     
     if roll > rand_threshold:   #high roll = random choice
-        moves = get_all_moves(position, WHITE, game)
+        moves = get_all_moves(position, WHITE if max_player else RED)
         if not moves:  # No moves
-            return position.evaluate(), position  # Return current state evaluation, no randomization
+            return position.evaluate(), None  # Return current state evaluation, no randomization
         choice = round(roll*(len(moves)-1))
         if max_player:
             return wrong_eval, moves[choice]
@@ -35,19 +45,21 @@ def expectimax(position, depth, max_player, game):
     
     if depth == 0 or position.winner() != None:
         if bad_behavior:
-            return (-1 * position.evaluate()), position
-        return position.evaluate(), position
+            return (-1 * position.evaluate()), None
+        return position.evaluate(), None
 
     if max_player:
         maxEval = float('-inf')
         best_move = None
-        moves = get_all_moves(position, WHITE, game)
+        moves = get_all_moves(position, WHITE)
         if not moves:  # No moves available
             if bad_behavior:
-                return (-1 * position.evaluate()), position
-            return position.evaluate(), position  # Return current state evaluation
+                return (-1 * position.evaluate()), None
+            return position.evaluate(), None  # Return current state evaluation
         for move in moves:
-            evaluation = expectimax(move, depth-1, False, game)[0]
+            token = position.make_move(move)
+            evaluation = search(position, depth-1, False, progress)[0]
+            position.unmake_move(token)
             if bad_behavior:
                 evaluation = -1 * evaluation
             maxEval = max(maxEval, evaluation)
@@ -57,11 +69,13 @@ def expectimax(position, depth, max_player, game):
     else:
         minEval = float('inf')
         best_move = None
-        moves = get_all_moves(position, RED, game)
+        moves = get_all_moves(position, RED)
         if not moves:  # No moves available
-            return position.evaluate(), position  # Return current state evaluation
+            return position.evaluate(), None  # Return current state evaluation
         for move in moves:
-            evaluation = expectimax(move, depth-1, True, game)[0]
+            token = position.make_move(move)
+            evaluation = search(position, depth-1, True, progress)[0]
+            position.unmake_move(token)
             if bad_behavior:
                 evaluation = -1 * evaluation
             minEval = min(minEval, evaluation)
@@ -69,27 +83,13 @@ def expectimax(position, depth, max_player, game):
                 best_move = move
         return minEval, best_move
 
-def simulate_move(piece, move, board, game, skip):
-    board.move(piece, move[0], move[1])
-    if skip:
-        board.remove(skip)
-    return board
-
-def get_all_moves(board, color, game):
-    moves = []
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)
-        for move, skip in valid_moves.items():
-            draw_moves(game)
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, game, skip)
-            moves.append(new_board)
-    return moves
+def simulate_move(board, move):
+    # Board after the chosen move; the searched board itself is left untouched
+    if move is None:
+        return board
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
 
-def draw_moves(game):
-    font = pygame.font.Font(None, SQUARE_SIZE // 2)  # Scale font size with SQUARE_SIZE (e.g., 50 for 100)
-    text = font.render("Thinking", True, GREEN)  # Use GREEN from constants
-    text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))  # Center at (400, 400) for 800x800
-    game.win.blit(text, text_rect)
-    pygame.display.update()
\ No newline at end of file
+def get_all_moves(board, color):
+    return board.legal_moves(color)
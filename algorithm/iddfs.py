@@ -1,77 +1,156 @@
 from copy import deepcopy
-import pygame
+import time
+from checkers.tablebase import probe_score
+from algorithm.transposition import EXACT, LOWER, UPPER, tt_key
+from algorithm.move_ordering import MoveOrderer
 
 RED = (255, 0, 0)
 WHITE = (255, 255, 255)
 
-def iddfs(position, max_depth, max_player, game):
-    best_eval = float('-inf') if max_player else float('inf')
-    best_move = None
- 
+WIN_SCORE = 10000        # Board.evaluate() score of a won position
+ASPIRATION_WINDOW = 1.0  # About one man either side of the previous score
+
+class SearchTimeout(Exception):
+    pass
+
+def iddfs(position, max_depth, max_player, game, tt=None, time_limit=1000, orderer=None, progress=None):
+    """
+    Iterative deepening alpha-beta bounded by wall-clock time.
+
+    Searches depth 1, 2, ... up to max_depth and returns the result of the
+    deepest iteration that finished within time_limit milliseconds. Each
+    iteration searches the previous principal variation first and starts
+    with an aspiration window around the previous score. Killer and history
+    move ordering carries over from one iteration to the next.
+    """
+    if tt is None and game is not None:
+        tt = game.tt  # Results are kept across moves of the same game
+    if orderer is None:
+        orderer = MoveOrderer()
+    deadline = time.perf_counter() + time_limit / 1000
+    best_eval, best_move = None, None
+    pv = []
+
     for depth in range(1, max_depth + 1): # Iteratively increase depth
-        eval_value, move = depth_limited_search(position, depth, max_player, game)
-        if max_player and eval_value > best_eval:
-            best_eval = eval_value
-            best_move = move
-        elif not max_player and eval_value < best_eval:
-            best_eval = eval_value # Update best move found so far    
-            best_move = move # Return the best move found in the deepest search
+        # The first iteration always completes so there is a move to play
+        limit = deadline if best_move is not None else None
+        if progress is not None:
+            progress.depth = depth
+        try:
+            if best_eval is None or abs(best_eval) >= WIN_SCORE:
+                eval_value, line = depth_limited_search(position, depth, max_player, progress, tt,
+                                                        float('-inf'), float('inf'), pv, limit, orderer)
+            else:
+                alpha, beta = best_eval - ASPIRATION_WINDOW, best_eval + ASPIRATION_WINDOW
+                eval_value, line = depth_limited_search(position, depth, max_player, progress, tt,
+                                                        alpha, beta, pv, limit, orderer)
+                # Outside the window the score is only a bound, search again on that side
+                if eval_value <= alpha:
+                    eval_value, line = depth_limited_search(position, depth, max_player, progress, tt,
+                                                            float('-inf'), beta, pv, limit, orderer)
+                elif eval_value >= beta:
+                    eval_value, line = depth_limited_search(position, depth, max_player, progress, tt,
+                                                            alpha, float('inf'), pv, limit, orderer)
+        except SearchTimeout:
+            break
+
+        if not line:  # Game over or no moves, deeper searches won't change that
+            break
+        best_eval, pv = eval_value, line
+        best_move = line[0] # Return the best move found in the deepest search
+        if progress is not None:
+            progress.best_move = best_move
+        if abs(best_eval) >= WIN_SCORE:  # Forced win or loss found
+            break
     
     if best_move is None:
         return position.evaluate(), position
         
-    return best_eval, best_move
+    return best_eval, simulate_move(position, best_move)
+
+def depth_limited_search(position, depth, max_player, progress, tt, alpha, beta, pv, deadline, orderer=None, ply=0):
+    # Alpha-beta in place with make/unmake; returns (evaluation, principal variation)
+    if progress is not None:
+        progress.node()
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout
+    if ply > 0:
+        # A repetition or the move-count rule ends the game in a draw
+        if position.is_draw():
+            return 0, []
+        # Positions in the endgame tablebase have an exact score
+        evaluation = probe_score(position, WHITE if max_player else RED)
+        if evaluation is not None:
+            return evaluation, []
+
+    tt_move = key = None
+    if tt is not None:
+        key = tt_key(position, WHITE if max_player else RED)
+        entry = tt.probe(key)
+        if entry is not None:
+            tt_move = entry.move
+            # Keep searching the root so the caller always gets a line back
+            if ply > 0 and entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.score, []
+                if entry.flag == LOWER and entry.score >= beta:
+                    return entry.score, []
+                if entry.flag == UPPER and entry.score <= alpha:
+                    return entry.score, []
 
-def depth_limited_search(position, depth, max_player, game):
     if depth == 0 or position.winner() is not None:
-        return position.evaluate(), position
+        evaluation = position.evaluate()
+        if tt is not None:
+            tt.store(key, depth, evaluation, EXACT)
+        return evaluation, []
 
-    if max_player:
-        maxEval = float('-inf')
-        best_move = None
-        for move in get_all_moves(position, WHITE, game):
-            evaluation, _ = depth_limited_search(move, depth - 1, False, game)
-            if evaluation > maxEval:
-                maxEval = evaluation
-                best_move = move
-        
-        if best_move is None:
-            return position.evaluate(), position
-            
-        return maxEval, best_move
-    else:
-        minEval = float('inf')
-        best_move = None
-        for move in get_all_moves(position, RED, game):
-            evaluation, _ = depth_limited_search(move, depth - 1, True, game)
-            if evaluation < minEval:
-                minEval = evaluation
-                best_move = move
-                
-        if best_move is None:
-            return position.evaluate(), position
-            
-        return minEval, best_move
-
-def simulate_move(piece, move, board, game, skip):
-    board.move(piece, move[0], move[1])
-    if skip:
-        board.remove(skip)
-    return board
-
-def get_all_moves(board, color, game):
-    moves = []
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)
-        for move, skip in valid_moves.items():
-            draw_moves(game, board)
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, game, skip)
-            moves.append(new_board)
+    # The principal variation move takes the place of the table's best move
+    first = pv[ply] if ply < len(pv) else tt_move
+    moves = get_all_moves(position, WHITE if max_player else RED, orderer, ply, first)
+    if not moves:  # No moves available
+        return position.evaluate(), []
+
+    alpha_orig, beta_orig = alpha, beta
+    best_eval = float('-inf') if max_player else float('inf')
+    best_line = []
+    for move in moves:
+        token = position.make_move(move)
+        try:
+            evaluation, line = depth_limited_search(position, depth - 1, not max_player, progress, tt,
+                                                    alpha, beta, pv if move == first else [], deadline, orderer, ply + 1)
+        finally:
+            position.unmake_move(token)
+        if max_player and evaluation > best_eval or not max_player and evaluation < best_eval:
+            best_eval = evaluation
+            best_line = [move] + line
+        if max_player:
+            alpha = max(alpha, best_eval)
+        else:
+            beta = min(beta, best_eval)
+        if beta <= alpha:  # Prune the branch
+            if orderer is not None:
+                orderer.cutoff(move, ply, depth)
+            break
+
+    if tt is not None:
+        if best_eval <= alpha_orig:
+            flag = UPPER
+        elif best_eval >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        tt.store(key, depth, best_eval, flag, best_line[0])
+    return best_eval, best_line
+
+def simulate_move(board, move):
+    # Board after the chosen move; the searched board itself is left untouched
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
+
+def get_all_moves(board, color, orderer=None, ply=0, hash_move=None):
+    moves = board.legal_moves(color)
+    if orderer is not None:
+        moves = orderer.order(moves, ply, hash_move)
     return moves
 
-def draw_moves(game, board):
-    if game:
-        pygame.draw.circle(game.win, (0, 255, 0), (280, 280), 50, 5)
-        pygame.display.update()
\ No newline at end of file
@@ -1,8 +1,16 @@
 
+import logging
 import math
 import random
+import time
+from collections import deque
 from copy import deepcopy
 from checkers.constants import RED, WHITE
+from checkers.bitboard import row_col
+from algorithm.rollout import rollout, ROLLOUT_LIMIT
+
+# Expansions and iterations are logged at DEBUG, one summary per search at INFO
+logger = logging.getLogger(__name__)
 
 class MCTSNode:
     def __init__(self, board, turn, parent=None, move=None):
@@ -10,12 +18,13 @@ class MCTSNode:
         self.turn = turn
         self.parent = parent
         self.children = []
-        self.move = move  # (piece, destination)
+        self.move = move  # (source, destination, captured) squares
         self.visits = 0
-        self.wins = 0
+        self.wins = 0  # Won playouts for the side that moved into this node
 
-        all_moves = board.get_all_valid_moves(turn)
-        self.untried_moves = [(piece, move) for piece, moves in all_moves.items() for move in moves]
+        # Nothing is expanded below a won or drawn position
+        self.terminal = self.is_terminal_node()
+        self.untried_moves = [] if self.terminal else board.legal_moves(turn)
 
     def ucb1(self, total_simulations, exploration=1.41):
         if self.visits == 0:
@@ -30,157 +39,164 @@ class MCTSNode:
     def expand(self):
         move = self.untried_moves.pop()
         board_copy = deepcopy(self.board)
-        piece, destination = move
-
-        row, col = piece.row, piece.col
-        dest_row, dest_col = destination
-
-        piece_copy = board_copy.get_piece(row, col)
-        board_copy.move(piece_copy, dest_row, dest_col)
+        board_copy.make_move(move)
 
         next_turn = RED if self.turn == WHITE else WHITE
         child_node = MCTSNode(board_copy, next_turn, parent=self, move=move)
         self.children.append(child_node)
 
-        print(f"[Expand] Expanded node: {piece} to {destination}, next turn: {'WHITE' if next_turn == WHITE else 'RED'}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Expanded node: %s to %s, next turn: %s", self.board.position.color_at(move[0]),
+                         row_col(move[1]), 'WHITE' if next_turn == WHITE else 'RED')
         return child_node
 
     def is_terminal_node(self):
-        return self.board.winner() is not None
-
-    def simulate(self, max_depth=1000):
-        sim_board = deepcopy(self.board)
-        turn = self.turn
-        depth = 0
-
-        while not sim_board.winner() and depth < max_depth:
-            all_moves = sim_board.get_all_valid_moves(turn)
-            if not all_moves:
-                print(f"[Simulate] No moves available for {'WHITE' if turn == WHITE else 'RED'} at depth {depth}")
-                break
-
-            # piece = random.choice(list(all_moves.keys()))
-            # move = random.choice(list(all_moves[piece].keys()))
-
-            # Get all available pieces and their possible moves
-            pieces = list(all_moves.keys())
-            
-            # Step 1: Prioritize captures if available
-            capture_pieces = []
-            for piece in pieces:
-                for move in all_moves[piece]:
-                    dest_row, dest_col = move
-                    # Check if this is a capture move (jumps more than one square)
-                    if abs(piece.row - dest_row) > 1:
-                        capture_pieces.append((piece, move))
-            
-            # Step 2: Prioritize king promotions if available and no captures
-            promotion_pieces = []
-            if not capture_pieces:
-                for piece in pieces:
-                    if not piece.king:  # Only consider non-king pieces
-                        for move in all_moves[piece]:
-                            dest_row, dest_col = move
-                            # Check if this move would result in a king promotion
-                            if (turn == WHITE and dest_row == 0) or (turn == RED and dest_row == 7):
-                                promotion_pieces.append((piece, move))
-            
-            # Step 3: Make a weighted random choice based on our priorities
-            if capture_pieces:
-                # Always choose a capture when available
-                piece, move = random.choice(capture_pieces)
-            elif promotion_pieces:
-                # Choose a king promotion when available and no captures
-                piece, move = random.choice(promotion_pieces)
-            else:
-                # No captures or promotions, use a simple heuristic
-                weighted_moves = []
-                for piece in pieces:
-                    for move in all_moves[piece]:
-                        dest_row, dest_col = move
-                        weight = 1.0  # Base weight
-                        
-                        # Kings are valuable - prefer keeping them safe in center
-                        if piece.king:
-                            # Center positions get higher weights
-                            center_weight = 4 - abs(3.5 - dest_col) - abs(3.5 - dest_row)
-                            weight *= (1.0 + 0.2 * center_weight)
-                        else:
-                            # Non-kings: prefer advancing toward opponent's side
-                            if turn == WHITE:
-                                # WHITE pieces want to advance toward row 0
-                                progress = piece.row - dest_row
-                            else:
-                                # RED pieces want to advance toward row 7
-                                progress = dest_row - piece.row
-                            
-                            # Give more weight to forward moves
-                            weight *= (1.0 + 0.3 * progress)
-                        
-                        weighted_moves.append((piece, move, weight))
-                
-                # Choose move based on weights
-                total_weight = sum(w for _, _, w in weighted_moves)
-                r = random.uniform(0, total_weight)
-                cumulative_weight = 0
-                for piece, move, weight in weighted_moves:
-                    cumulative_weight += weight
-                    if cumulative_weight >= r:
-                        break
-
-            # Execute the selected move
-            row, col = piece.row, piece.col
-            dest_row, dest_col = move
-
-            piece_copy = sim_board.get_piece(row, col)
-            sim_board.move(piece_copy, dest_row, dest_col)
-
-            turn = RED if turn == WHITE else WHITE
-            depth += 1
-
-        winner = sim_board.winner()
-        print(f"[Simulate] Simulation ended at depth {depth}. Winner: {winner}")
-        return 1 if winner == self.turn else 0
-
-    def backpropagate(self, result):
-        self.visits += 1
-        self.wins += result
-        if self.parent:
-            self.parent.backpropagate(result)
-
-def mcts_move(board, turn, iterations=500):
+        return self.board.winner() is not None or self.board.is_draw()
+
+    def simulate(self, max_depth=ROLLOUT_LIMIT, rng=random, stats=None):
+        """Winner of a playout from this node, None for a draw."""
+        if self.terminal:
+            return self.board.winner()
+        return rollout(self.board, self.turn, max_depth, rng, stats=stats)
+
+    def backpropagate(self, winner):
+        # Each node counts the win for the player who chose it, so UCB1 at the parent picks its best move
+        node = self
+        while node is not None:
+            node.visits += 1
+            if node.parent is not None and winner == node.parent.turn:
+                node.wins += 1
+            node = node.parent
+
+class MCTSTree:
+    """
+    Search tree kept from one move of a game to the next.
+
+    root_for() looks for the new position among the nodes already in the
+    tree (after the AI's move and the opponent's reply it is two plies
+    below the old root) and keeps that subtree, so the visits it already
+    has count towards the next search. best_move() can be called at any
+    time, also while a search on another thread is growing the tree.
+    """
+    def __init__(self, reuse_depth=2):
+        self.reuse_depth = reuse_depth
+        self.root = None
+
+    def root_for(self, board, turn):
+        found = None
+        if self.root is not None:
+            queue = deque([(self.root, 0)])
+            while queue:
+                node, depth = queue.popleft()
+                if node.turn == turn and node.board.position == board.position:
+                    found = node
+                    break
+                if depth < self.reuse_depth:
+                    queue.extend((child, depth + 1) for child in node.children)
+        if found is None:
+            found = MCTSNode(deepcopy(board), turn)
+        # Detach it so backpropagation stops here and the rest of the old tree can be freed
+        found.parent = None
+        self.root = found
+        return found
+
+    def best_move(self):
+        # Most visited move at the root so far, as an engine move
+        return most_visited(self.root) if self.root is not None else None
+
+def mcts_move(board, turn, iterations=500, progress=None, seed=None, time_limit=None, tree=None):
+    """
+    Pick a move for turn with Monte Carlo Tree Search.
+
+    The search stops after iterations iterations (each expands at most one
+    node) or time_limit milliseconds, whichever comes first; pass
+    iterations=None to search for the whole time limit. With an MCTSTree
+    the tree is carried over to the next call. progress.best_move always
+    holds the most visited move so far.
+    """
     if board.winner():
-        print("[MCTS] Early exit: board already has a winner")
+        logger.debug("Early exit: board already has a winner")
         return None
-    board_copy = deepcopy(board)
-    root = MCTSNode(board_copy, turn)
-
-    for i in range(iterations):
+    # A seed makes the whole search repeatable
+    rng = random.Random(seed) if seed is not None else random
+    root = tree.root_for(board, turn) if tree is not None else None
+    root = search(board, turn, iterations, progress, rng, time_limit, root)
+    return pick_move(board, turn, {child.move: child.visits for child in root.children}, rng)
+
+def search(board, turn, iterations=500, progress=None, rng=random, time_limit=None, root=None):
+    # Grows the tree under root (a new one on a copy of board by default) and returns the root
+    if root is None:
+        board_copy = deepcopy(board)
+        root = MCTSNode(board_copy, turn)
+    start = time.perf_counter()
+    deadline = start + time_limit / 1000 if time_limit is not None else None
+    stats = {}
+
+    i = 0
+    while iterations is None or i < iterations:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if progress is not None:
+            progress.node()  # One node per iteration
         if i % 50 == 0:
-            print(f"[MCTS] Iteration {i}")
-        node = root
-        # Selection
-        while node.untried_moves == [] and node.children:
-            node = node.best_child()
-
-        # Expansion
-        if node.untried_moves:
-            node = node.expand()
+            logger.debug("Iteration %d", i)
+        node = select_leaf(root)
 
         # Simulation
-        result = node.simulate()
+        winner = node.simulate(rng=rng, stats=stats)
 
         # Backpropagation
-        node.backpropagate(result)
-
+        node.backpropagate(winner)
+
+        if progress is not None:
+            progress.best_move = most_visited(root)
+        i += 1
+
+    if logger.isEnabledFor(logging.INFO):
+        log_summary(logger, i, time.perf_counter() - start, stats.get("plies", 0), tree_size(root))
+    return root
+
+def log_summary(log, iterations, elapsed, plies, nodes):
+    # One record per search instead of a line per rollout
+    log.info("MCTS search: %d iterations in %.2fs (%.0f rollouts/s), average rollout %.1f plies, tree %d nodes",
+                iterations, elapsed, iterations / elapsed if elapsed > 0 else 0.0,
+                plies / iterations if iterations else 0.0, nodes)
+
+def tree_size(root):
+    size = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        size += 1
+        stack.extend(node.children)
+    return size
+
+def most_visited(root):
     if not root.children:
-        print("[MCTS] No children were expanded — returning random valid move")
+        return None
+    return max(root.children, key=lambda n: n.visits).move
+
+def select_leaf(root):
+    node = root
+    # Selection, which stops at terminal nodes as they have no moves to expand
+    while node.untried_moves == [] and node.children:
+        node = node.best_child()
+
+    # Expansion
+    if node.untried_moves:
+        node = node.expand()
+    return node
+
+def pick_move(board, turn, visits, rng=random):
+    # Most visited root move, from a dict of engine move -> visit count
+    if not visits:
+        logger.debug("No children were expanded, returning a random valid move")
         all_moves = board.get_all_valid_moves(turn)
         if not all_moves:
             return None
-        piece = random.choice(list(all_moves.keys()))
-        move = random.choice(list(all_moves[piece].keys()))
+        piece = rng.choice(list(all_moves.keys()))
+        move = rng.choice(list(all_moves[piece].keys()))
         return piece, move
 
-    best = max(root.children, key=lambda n: n.visits)
-    return best.move
+    source, destination, _ = max(visits, key=visits.get)
+    return board.get_piece(*row_col(source)), row_col(destination)
@@ -0,0 +1,169 @@
+"""
+MCTS with the tree kept in flat typed arrays instead of MCTSNode objects.
+
+Node i is described by entry i of each array: parent, first child and next
+sibling links, the move that leads to it packed into one integer, visits,
+wins, and how many of its legal moves have been expanded. No node keeps a
+board; the single board of the tree is played down the selected path with
+make_move and taken back afterwards, so a node costs a few dozen bytes
+and a 100k iteration search stays in the low megabytes. max_nodes puts a
+hard cap on the tree; once it is full, iterations keep running rollouts
+from the leaves they reach without growing the tree.
+
+Selection, expansion order, UCB1 and the rollouts are the same as in
+algorithm.mcts, so with the same seed both pick the same move.
+"""
+import logging
+import math
+import random
+import time
+from array import array
+from copy import deepcopy
+
+from checkers.constants import RED, WHITE
+from algorithm.mcts import pick_move, log_summary
+from algorithm.rollout import rollout
+
+logger = logging.getLogger(__name__)
+
+NO_NODE = -1
+
+def encode_move(move):
+    # (source, destination, captured) squares in one integer
+    source, destination, captured = move
+    return source | destination << 5 | captured << 10
+
+def decode_move(code):
+    return code & 31, code >> 5 & 31, code >> 10
+
+def move_count(board, turn):
+    # Legal moves to expand, none in a won or drawn position
+    if board.winner() is not None or board.is_draw():
+        return 0
+    return len(board.legal_moves(turn))
+
+class ArrayTree:
+    def __init__(self, board, turn, max_nodes=None):
+        self.board = deepcopy(board)
+        self.turn = turn
+        self.max_nodes = max_nodes
+        self.parent = array('l')
+        self.first_child = array('l')
+        self.next_sibling = array('l')
+        self.move = array('q')
+        self.visits = array('l')
+        self.wins = array('l')
+        # Expanded children so far and number of legal moves
+        self.expanded = array('h')
+        self.move_count = array('h')
+        self.add_node(NO_NODE, 0, move_count(self.board, turn))
+
+    def __len__(self):
+        return len(self.visits)
+
+    def add_node(self, parent, code, move_count):
+        node = len(self.visits)
+        self.parent.append(parent)
+        self.first_child.append(NO_NODE)
+        self.next_sibling.append(NO_NODE)
+        self.move.append(code)
+        self.visits.append(0)
+        self.wins.append(0)
+        self.expanded.append(0)
+        self.move_count.append(move_count)
+        if parent != NO_NODE:
+            # Append to the end of the sibling list so children keep their expansion order
+            child = self.first_child[parent]
+            if child == NO_NODE:
+                self.first_child[parent] = node
+            else:
+                while self.next_sibling[child] != NO_NODE:
+                    child = self.next_sibling[child]
+                self.next_sibling[child] = node
+        return node
+
+    def children(self, node):
+        child = self.first_child[node]
+        while child != NO_NODE:
+            yield child
+            child = self.next_sibling[child]
+
+    def best_child(self, node, exploration=1.41):
+        visits, wins = self.visits, self.wins
+        children = list(self.children(node))
+        log_total = math.log(sum(visits[child] for child in children))
+
+        def ucb1(child):
+            if visits[child] == 0:
+                return float('inf')
+            return wins[child] / visits[child] + exploration * math.sqrt(log_total / visits[child])
+
+        return max(children, key=ucb1)
+
+    def iterate(self, rng=random, stats=None):
+        # One selection, expansion, rollout and backup, replaying moves from the root
+        board, turn, node = self.board, self.turn, 0
+        undo = []
+
+        # Selection
+        while self.expanded[node] == self.move_count[node] and self.first_child[node] != NO_NODE:
+            node = self.best_child(node)
+            undo.append(board.make_move(decode_move(self.move[node])))
+            turn = RED if turn == WHITE else WHITE
+
+        # Expansion, in the order MCTSNode pops its untried moves
+        if self.expanded[node] < self.move_count[node] and (self.max_nodes is None or len(self) < self.max_nodes):
+            self.expanded[node] += 1
+            move = board.legal_moves(turn)[-self.expanded[node]]
+            undo.append(board.make_move(move))
+            turn = RED if turn == WHITE else WHITE
+            node = self.add_node(node, encode_move(move), move_count(board, turn))
+
+        # Simulation; a terminal node's result is backed up without a rollout
+        if self.move_count[node] == 0:
+            winner = board.winner()  # None for a draw
+        else:
+            winner = rollout(board, turn, rng=rng, stats=stats)
+        while undo:
+            board.unmake_move(undo.pop())
+
+        # Backpropagation; a node's wins are the side's that moved into it, as in MCTSNode
+        mover = RED if turn == WHITE else WHITE
+        while node != NO_NODE:
+            self.visits[node] += 1
+            if winner == mover and self.parent[node] != NO_NODE:
+                self.wins[node] += 1
+            mover = RED if mover == WHITE else WHITE
+            node = self.parent[node]
+
+    def root_visits(self):
+        # Engine move -> visits for the root's children
+        return {decode_move(self.move[child]): self.visits[child] for child in self.children(0)}
+
+    def best_move(self):
+        visits = self.root_visits()
+        return max(visits, key=visits.get) if visits else None
+
+def array_mcts_move(board, turn, iterations=500, progress=None, seed=None, time_limit=None, max_nodes=None):
+    """Same interface and result as mcts_move, on an ArrayTree."""
+    if board.winner():
+        return None
+    rng = random.Random(seed) if seed is not None else random
+    tree = ArrayTree(board, turn, max_nodes)
+    start = time.perf_counter()
+    deadline = start + time_limit / 1000 if time_limit is not None else None
+    stats = {}
+
+    i = 0
+    while iterations is None or i < iterations:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if progress is not None:
+            progress.node()  # One node per iteration
+        tree.iterate(rng, stats)
+        if progress is not None:
+            progress.best_move = tree.best_move()
+        i += 1
+
+    log_summary(logger, i, time.perf_counter() - start, stats.get("plies", 0), len(tree))
+    return pick_move(board, turn, tree.root_visits(), rng)
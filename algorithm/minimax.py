@@ -1,19 +1,53 @@
 from copy import deepcopy
-import pygame
-from checkers.constants import RED, WHITE, SQUARE_SIZE, GREEN, WIDTH, HEIGHT  # Import necessary constants
+from checkers.constants import RED, WHITE  # Import necessary constants
+from checkers.tablebase import probe_score
+from algorithm.transposition import EXACT, tt_key
 
-def minimax(position, depth, max_player, game):
+def minimax(position, depth, max_player, game, tt=None, progress=None):
+    if tt is None and game is not None:
+        tt = game.tt  # Results are kept across moves of the same game
+    if progress is not None:
+        progress.depth = depth
+    evaluation, best_move = search(position, depth, max_player, progress, tt)
+    return evaluation, simulate_move(position, best_move)
+
+def search(position, depth, max_player, progress=None, tt=None, ply=0):
+    # Searches in place with make/unmake and returns (evaluation, best move)
+    if progress is not None:
+        progress.node()
+    if ply > 0:
+        # A repetition or the move-count rule ends the game in a draw
+        if position.is_draw():
+            return 0, None
+        # Positions in the endgame tablebase have an exact score
+        evaluation = probe_score(position, WHITE if max_player else RED)
+        if evaluation is not None:
+            return evaluation, None
+    if tt is not None:
+        # Plain minimax only ever produces exact scores
+        key = tt_key(position, WHITE if max_player else RED)
+        entry = tt.probe(key)
+        if entry is not None and entry.depth >= depth:
+            return entry.score, entry.move
+    evaluation, best_move = _search(position, depth, max_player, progress, tt, ply)
+    if tt is not None:
+        tt.store(key, depth, evaluation, EXACT, best_move)
+    return evaluation, best_move
+
+def _search(position, depth, max_player, progress, tt, ply):
     if depth == 0 or position.winner() != None:
-        return position.evaluate(), position
+        return position.evaluate(), None
 
     if max_player:
         maxEval = float('-inf')
         best_move = None
-        moves = get_all_moves(position, WHITE, game)
+        moves = get_all_moves(position, WHITE)
         if not moves:  # No moves available
-            return position.evaluate(), position  # Return current state evaluation
+            return position.evaluate(), None  # Return current state evaluation
         for move in moves:
-            evaluation = minimax(move, depth-1, False, game)[0]
+            token = position.make_move(move)
+            evaluation = search(position, depth-1, False, progress, tt, ply + 1)[0]
+            position.unmake_move(token)
             maxEval = max(maxEval, evaluation)
             if maxEval == evaluation:
                 best_move = move
@@ -21,37 +55,26 @@ def minimax(position, depth, max_player, game):
     else:
         minEval = float('inf')
         best_move = None
-        moves = get_all_moves(position, RED, game)
+        moves = get_all_moves(position, RED)
         if not moves:  # No moves available
-            return position.evaluate(), position  # Return current state evaluation
+            return position.evaluate(), None  # Return current state evaluation
         for move in moves:
-            evaluation = minimax(move, depth-1, True, game)[0]
+            token = position.make_move(move)
+            evaluation = search(position, depth-1, True, progress, tt, ply + 1)[0]
+            position.unmake_move(token)
             minEval = min(minEval, evaluation)
             if minEval == evaluation:
                 best_move = move
         return minEval, best_move
 
-def simulate_move(piece, move, board, game, skip):
-    board.move(piece, move[0], move[1])
-    if skip:
-        board.remove(skip)
-    return board
+def simulate_move(board, move):
+    # Board after the chosen move; the searched board itself is left untouched
+    if move is None:
+        return board
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
 
-def get_all_moves(board, color, game):
-    moves = []
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)
-        for move, skip in valid_moves.items():
-            draw_moves(game)
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, game, skip)
-            moves.append(new_board)
-    return moves
+def get_all_moves(board, color):
+    return board.legal_moves(color)
 
-def draw_moves(game):
-    font = pygame.font.Font(None, SQUARE_SIZE // 2)  # Scale font size with SQUARE_SIZE (e.g., 50 for 100)
-    text = font.render("Thinking", True, GREEN)  # Use GREEN from constants
-    text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))  # Center at (400, 400) for 800x800
-    game.win.blit(text, text_rect)
-    pygame.display.update()
\ No newline at end of file
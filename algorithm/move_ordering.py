@@ -0,0 +1,54 @@
+from checkers.bitboard import popcount
+
+# Sort keys, from most to least important
+CAPTURE_SCORE = 1 << 30  # per captured piece, so multi-jumps come before single jumps
+HASH_MOVE_SCORE = 1 << 29
+KILLER_SCORE = 1 << 28
+HISTORY_LIMIT = KILLER_SCORE - 1
+
+class MoveOrderer:
+    """
+    Orders moves for alpha-beta so that cutoffs come early.
+
+    Captures go first (most pieces taken first), then the transposition
+    table / principal variation move, then the killer moves that caused a
+    cutoff at the same ply, then quiet moves by history heuristic score.
+    Keep one orderer for a whole search (or all iterations of an iterative
+    deepening search) so killers and history accumulate.
+    """
+    def __init__(self, killers_per_ply=2):
+        self.killers_per_ply = killers_per_ply
+        self.killers = []
+        self.history = {}
+
+    def order(self, moves, ply=0, hash_move=None):
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+
+        def score(move):
+            value = 0
+            if move[2]:
+                value += CAPTURE_SCORE * popcount(move[2])
+            if move == hash_move:
+                value += HASH_MOVE_SCORE
+            elif move in killers:
+                value += KILLER_SCORE - killers.index(move)
+            else:
+                value += history.get((move[0], move[1]), 0)
+            return value
+
+        # sorted() is stable, so equal moves keep the generator's order
+        return sorted(moves, key=score, reverse=True)
+
+    def cutoff(self, move, ply, depth):
+        # Record a quiet move that refuted the position; captures are already ordered first
+        if move[2]:
+            return
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.killers_per_ply:]
+        key = (move[0], move[1])
+        self.history[key] = min(self.history.get(key, 0) + depth * depth, HISTORY_LIMIT)
@@ -1,140 +1,173 @@
 from copy import deepcopy
-import pygame
-from checkers.constants import RED, WHITE, SQUARE_SIZE, GREEN, WIDTH, HEIGHT
+from checkers.constants import RED, WHITE
+from checkers.bitboard import popcount, row_col, squares, up_left, up_right, down_left, down_right
+from checkers.evaluation import jumpers
+from checkers.tablebase import probe_score
+from algorithm.transposition import EXACT, LOWER, UPPER, tt_key
+from algorithm.move_ordering import MoveOrderer
+
+def negamax(position, depth, color, game, tt=None, orderer=None, progress=None):
+    if tt is None and game is not None:
+        tt = game.tt  # Results are kept across moves of the same game
+    if orderer is None:
+        orderer = MoveOrderer()
+    if progress is not None:
+        progress.depth = depth
+    evaluation, best_move = search(position, depth, color, progress, float('-inf'), float('inf'), tt, orderer)
+    return evaluation, simulate_move(position, best_move)
+
+def search(position, depth, color, progress=None, alpha=float('-inf'), beta=float('inf'), tt=None, orderer=None, ply=0):
+    # Negamax with alpha-beta pruning, in place with make/unmake; returns (evaluation, best move)
+    if progress is not None:
+        progress.node()
+    if ply > 0:
+        # A repetition or the move-count rule ends the game in a draw
+        if position.is_draw():
+            return 0, None
+        # Positions in the endgame tablebase have an exact score
+        evaluation = probe_score(position, color)
+        if evaluation is not None:
+            return (evaluation if color == WHITE else -evaluation), None
+    # Scores are from the point of view of the side to move, which is part of the table key
+    tt_move = key = None
+    if tt is not None:
+        key = tt_key(position, color)
+        entry = tt.probe(key)
+        if entry is not None:
+            tt_move = entry.move
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.score, entry.move
+                if entry.flag == LOWER:
+                    alpha = max(alpha, entry.score)
+                else:
+                    beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return entry.score, entry.move
+    alpha_orig = alpha
 
-def negamax(position, depth, color, game):
     # Base case: depth 0 or game over
     if depth == 0 or position.winner() is not None:
-        return evaluate_board(position, color), position
+        evaluation = evaluate_board(position, color)
+        if tt is not None:
+            tt.store(key, depth, evaluation, EXACT)
+        return evaluation, None
 
     maxEval = float('-inf')
     best_move = None
-    moves = get_all_moves(position, color, game)
+    moves = get_all_moves(position, color, orderer, ply, tt_move)
     
     if not moves:  # No moves available
-        return evaluate_board(position, color), position
+        return evaluate_board(position, color), None
 
     for move in moves:
-        evaluation = -negamax(move, depth-1, RED if color == WHITE else WHITE, game)[0]
+        token = position.make_move(move)
+        evaluation = -search(position, depth-1, RED if color == WHITE else WHITE, progress, -beta, -alpha, tt, orderer, ply + 1)[0]
+        position.unmake_move(token)
         if evaluation > maxEval:
             maxEval = evaluation
             best_move = move
-
+            if ply == 0 and progress is not None:
+                progress.best_move = move
+        alpha = max(alpha, maxEval)
+        if alpha >= beta:  # Prune the branch
+            if orderer is not None:
+                orderer.cutoff(move, ply, depth)
+            break
+
+    if tt is not None:
+        if maxEval <= alpha_orig:
+            flag = UPPER
+        elif maxEval >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        tt.store(key, depth, maxEval, flag, best_move)
     return maxEval, best_move
 
+# Precomputed square tables
+CENTER = sum(1 << sq for sq in range(32) if row_col(sq)[1] in (3, 4))
+EDGE = sum(1 << sq for sq in range(32) if row_col(sq)[0] in (0, 7) or row_col(sq)[1] in (0, 7))
+# Rows advanced towards the opponent's side, for every piece including kings
+ADVANCEMENT = {
+    WHITE: [7 - row_col(sq)[0] for sq in range(32)],
+    RED: [row_col(sq)[0] for sq in range(32)],
+}
+# Diagonal neighbours of each square
+NEIGHBOURS = [up_left(1 << sq) | up_right(1 << sq) | down_left(1 << sq) | down_right(1 << sq) for sq in range(32)]
+
 def evaluate_board(board, color):
-    # Initialize scores
+    """
+    Score for color (White's material counted positive when color is White).
+    One pass over the pieces collects the positional terms and every
+    piece's moves; the captures found there are the attack map that the
+    threat, multi-jump, king safety and mobility terms all share.
+    """
+    position = board.position
+    opp_color = RED if color == WHITE else WHITE
+    kings = position.kings
+
     attack_score = 0
     king_safety_score = 0
     material_positional_score = 0
     endgame_score = 0
 
-    # Count total pieces for endgame check
-    total_pieces = len(board.get_all_pieces(RED)) + len(board.get_all_pieces(WHITE))
-    is_endgame = total_pieces <= 6
-
-    # Helper to check if a square is central
-    def is_central(col):
-        return col in [3, 4]
-
-    # Helper to check if a square is on edge
-    def is_edge(row, col):
-        return row in [0, 7] or col in [0, 7]
-
-    # Helper to check adjacent pieces
-    def has_adjacent_ally(board, row, col, piece_color):
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            if 0 <= r < 8 and 0 <= c < 8:
-                piece = board.get_piece(r, c)
-                if piece != 0 and piece.color == piece_color:
-                    return True
-        return False
-
-    # Attack potential
-    for c in [RED, WHITE]:
-        multiplier = 1 if c == color else -1
-        for piece in board.get_all_pieces(c):
-            valid_moves = board.get_valid_moves(piece)
-            for move, skip in valid_moves.items():
-                if skip:  # Capture move
-                    attack_score += 5 * multiplier
-                    # Check for multi-jump potential (simplified)
-                    temp_board = deepcopy(board)
-                    temp_piece = temp_board.get_piece(piece.row, piece.col)
-                    temp_board.move(temp_piece, move[0], move[1])
-                    temp_board.remove(skip)
-                    more_jumps = any(s for m, s in temp_board.get_valid_moves(temp_piece).items() if s)
-                    if more_jumps:
-                        attack_score += 2 * multiplier
-
-        # Threatened pieces
-        for piece in board.get_all_pieces(c):
-            for opp_piece in board.get_all_pieces(RED if c == WHITE else WHITE):
-                opp_moves = board.get_valid_moves(opp_piece)
-                for move, skip in opp_moves.items():
-                    if skip and any(s.row == piece.row and s.col == piece.col for s in skip):
-                        attack_score -= 3 * multiplier
-
-    # King safety
+    captures = {RED: [], WHITE: []}
+    king_mobility = {RED: 0, WHITE: 0}
     for c in [RED, WHITE]:
         multiplier = 1 if c == color else -1
-        for piece in board.get_all_pieces(c):
-            if piece.king:
-                if is_edge(piece.row, piece.col):
+        own = position.pieces(c)
+        advancement = ADVANCEMENT[c]
+        for sq in squares(own):
+            bit = 1 << sq
+            moves = position.piece_moves(sq)
+            # Material: men 10, kings 15
+            score = 10
+            if kings & bit:
+                score = 15
+                king_mobility[c] += len(moves)
+                # King safety: stay off the edge, hold the centre
+                if bit & EDGE:
                     king_safety_score -= 2 * multiplier
-                if is_central(piece.col):
+                if bit & CENTER:
                     king_safety_score += 3 * multiplier
-                # Check if king is threatened
-                for opp_piece in board.get_all_pieces(RED if c == WHITE else WHITE):
-                    opp_moves = board.get_valid_moves(opp_piece)
-                    for move, skip in opp_moves.items():
-                        if skip and any(s.row == piece.row and s.col == piece.col for s in skip):
-                            king_safety_score -= 5 * multiplier
-
-    # Material and positional factors
+            # Advancement, center control and defensive structure
+            score += advancement[sq]
+            if bit & CENTER:
+                score += 2
+            if NEIGHBOURS[sq] & own:
+                score += 1
+            material_positional_score += score * multiplier
+            for dst, captured in moves.items():
+                if captured:
+                    captures[c].append((sq, dst, captured))
+
     for c in [RED, WHITE]:
         multiplier = 1 if c == color else -1
-        for piece in board.get_all_pieces(c):
-            # Material
-            if piece.king:
-                material_positional_score += 15 * multiplier
-            else:
-                material_positional_score += 10 * multiplier
-            # Advancement
-            if c == WHITE:
-                material_positional_score += (7 - piece.row) * multiplier
-            else:  # RED
-                material_positional_score += piece.row * multiplier
-            # Center control
-            if is_central(piece.col):
-                material_positional_score += 2 * multiplier
-            # Defensive structure
-            if has_adjacent_ally(board, piece.row, piece.col, c):
-                material_positional_score += 1 * multiplier
+        # Attack potential, with a bonus when the capturing piece could jump again
+        for move in captures[c]:
+            attack_score += 5 * multiplier
+            token = position.make_move(move)
+            if jumpers(position, c) & (1 << move[1]):
+                attack_score += 2 * multiplier
+            position.unmake_move(token)
+        # Threatened pieces and kings, once for every opponent capture that takes them
+        for _, _, captured in captures[RED if c == WHITE else WHITE]:
+            attack_score -= 3 * multiplier * popcount(captured)
+            king_safety_score -= 5 * multiplier * popcount(captured & kings)
 
     # Endgame evaluation
+    is_endgame = popcount(position.red | position.white) <= 6
     if is_endgame:
+        sign = 1 if color == WHITE else -1
         # Material advantage
-        white_pieces = len(board.get_all_pieces(WHITE))
-        red_pieces = len(board.get_all_pieces(RED))
-        material_diff = white_pieces - red_pieces
-        endgame_score += 20 * material_diff * (1 if color == WHITE else -1)
-
+        endgame_score += 20 * (popcount(position.white) - popcount(position.red)) * sign
         # King mobility
-        for piece in board.get_all_pieces(color):
-            if piece.king:
-                endgame_score += 3 * len(board.get_valid_moves(piece)) * (1 if color == WHITE else -1)
-        for piece in board.get_all_pieces(RED if color == WHITE else WHITE):
-            if piece.king:
-                endgame_score -= 3 * len(board.get_valid_moves(piece)) * (1 if color == WHITE else -1)
-
+        endgame_score += 3 * king_mobility[color] * sign
+        endgame_score -= 3 * king_mobility[opp_color] * sign
         # Trap bonus
-        opp_color = RED if color == WHITE else WHITE
-        opp_moves = get_all_moves(board, opp_color, game)
-        if not opp_moves:
-            endgame_score += 50 * (1 if color == WHITE else -1)
+        if not position.has_moves(opp_color):
+            endgame_score += 50 * sign
 
     # Combine scores
     total_score = attack_score + king_safety_score + material_positional_score
@@ -143,27 +176,16 @@ def evaluate_board(board, color):
 
     return total_score
 
-def simulate_move(piece, move, board, game, skip):
-    board.move(piece, move[0], move[1])
-    if skip:
-        board.remove(skip)
-    return board
-
-def get_all_moves(board, color, game):
-    moves = []
-    for piece in board.get_all_pieces(color):
-        valid_moves = board.get_valid_moves(piece)
-        for move, skip in valid_moves.items():
-            draw_moves(game)
-            temp_board = deepcopy(board)
-            temp_piece = temp_board.get_piece(piece.row, piece.col)
-            new_board = simulate_move(temp_piece, move, temp_board, game, skip)
-            moves.append(new_board)
+def simulate_move(board, move):
+    # Board after the chosen move; the searched board itself is left untouched
+    if move is None:
+        return board
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
+
+def get_all_moves(board, color, orderer=None, ply=0, tt_move=None):
+    moves = board.legal_moves(color)
+    if orderer is not None:
+        moves = orderer.order(moves, ply, tt_move)
     return moves
-
-def draw_moves(game):
-    font = pygame.font.Font(None, SQUARE_SIZE // 2)
-    text = font.render("Thinking", True, GREEN)
-    text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-    game.win.blit(text, text_rect)
-    pygame.display.update()
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Opening book: the move to play in the positions every game starts with.
+
+    python -m algorithm.opening_book --plies 6 --depth 8
+
+builds it offline. Starting from the initial position, once for each side,
+the book side's positions are searched with alpha-beta to the given depth
+and only the move found is followed, while every reply of the other side
+is followed. So the book answers anything the opponent plays for the
+first plies of the game, whichever side the AI has.
+
+The book is keyed like the transposition table, by Board.hash with the
+side to move mixed in. On disk it is a header followed by fixed size
+records (key, source, destination, captured mask) sorted by key; it is
+read into a dict the first time it is probed, so a probe is one lookup.
+"""
+import argparse
+import os
+import struct
+import time
+
+from checkers.board import Board
+from checkers.constants import RED, WHITE
+from algorithm.alpha_beta_pruning import search
+from algorithm.move_ordering import MoveOrderer
+from algorithm.transposition import TranspositionTable, tt_key
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "opening_book.bin")
+
+MAGIC = b"CKOB"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")   # magic, version, number of records
+RECORD = struct.Struct("<QBBI")   # position key, source, destination, captured mask
+
+def build(plies=6, depth=8, log=print):
+    """{position key: move} for both sides over the first plies of the game."""
+    book = {}
+    tt = TranspositionTable(1 << 20)
+    for color in (RED, WHITE):
+        start = time.perf_counter()
+        frontier = [Board()]
+        turn = RED
+        for ply in range(plies):
+            following = {}
+            for board in frontier:
+                if board.winner() is not None:
+                    continue
+                if turn == color:
+                    key = tt_key(board, turn)
+                    if key not in book:
+                        book[key] = search(board, depth, turn == WHITE, None, float('-inf'), float('inf'),
+                                           tt, MoveOrderer())[1]
+                    moves = [book[key]]
+                else:
+                    moves = board.legal_moves(turn)
+                for move in moves:
+                    child = Board.from_position(board.position.copy())
+                    child.make_move(move)
+                    following[tt_key(child, turn)] = child  # Transpositions are expanded once
+            frontier = list(following.values())
+            turn = RED if turn == WHITE else WHITE
+        log(f"{'RED' if color == RED else 'WHITE'}: {len(book)} positions in the book "
+            f"after {time.perf_counter() - start:.1f}s")
+    return book
+
+def write(path, book):
+    with open(path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, len(book)))
+        for key in sorted(book):
+            output.write(RECORD.pack(key, *book[key]))
+
+def read(path):
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} opening book")
+    book = {}
+    for i in range(count):
+        key, *move = RECORD.unpack_from(data, HEADER.size + i * RECORD.size)
+        book[key] = tuple(move)
+    return book
+
+_books = {}
+
+def load(path=DEFAULT_PATH):
+    """The book at path, read once per process; empty if there is no such file."""
+    if path not in _books:
+        _books[path] = read(path) if os.path.exists(path) else {}
+    return _books[path]
+
+def book_move(board, color, path=DEFAULT_PATH):
+    """The book move for color on board as an engine move, or None out of book."""
+    move = load(path).get(tt_key(board, color))
+    # Guards against a hash collision with a position outside the book
+    if move is not None and move in board.legal_moves(color):
+        return move
+    return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the opening book")
+    parser.add_argument("--plies", type=int, default=6, help="how far into the game the book reaches")
+    parser.add_argument("--depth", type=int, default=8, help="alpha-beta depth for each book move")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    args = parser.parse_args()
+    book = build(args.plies, args.depth)
+    write(args.output, book)
+    print(f"wrote {len(book)} positions to {args.output}")
@@ -0,0 +1,193 @@
+"""
+Root-split parallel alpha-beta and minimax.
+
+The moves at the root are shared out over a ProcessPoolExecutor. A worker
+gets the position as its three bitboard integers, with the quiet plies
+and recent hashes that draws depend on, plus the move to score, never a
+pickled Board or Piece graph, and keeps its own transposition
+table from one task to the next. Alpha-beta searches the first root move
+on its own and then all the others at once with the bound it produced
+(Young Brothers Wait at the root), so the younger moves still get cut off.
+
+Run python -m algorithm.parallel to measure the speedup per worker count.
+"""
+import argparse
+import os
+import time
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from checkers.bitboard import Position
+from checkers.board import Board
+from checkers.constants import RED, WHITE
+from algorithm.alpha_beta_pruning import alpha_beta_pruning, search as alpha_beta_search
+from algorithm.minimax import minimax, search as minimax_search
+from algorithm.move_ordering import MoveOrderer
+from algorithm.progress import SearchProgress, SearchCancelled
+from algorithm.transposition import EXACT, TranspositionTable, tt_key
+
+ALPHA_BETA, MINIMAX = "alpha_beta", "minimax"
+DEFAULT_WORKERS = os.cpu_count() or 1
+POLL_INTERVAL = 0.05  # Seconds between cancellation checks while waiting on workers
+
+# Pools by worker count, started once and reused between searches
+_executors = {}
+# Worker side tables by algorithm; minimax treats every entry as exact
+_tables = {}
+
+def get_executor(workers=None):
+    workers = workers or DEFAULT_WORKERS
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[workers]
+
+def start_workers(workers=None):
+    """Start every worker process of the pool now rather than on the first search."""
+    workers = workers or DEFAULT_WORKERS
+    executor = get_executor(workers)
+    # The pool adds a process for each task submitted while none is idle
+    for future in [executor.submit(os.getpid) for _ in range(workers)]:
+        future.result()
+    return executor
+
+def shutdown():
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
+
+def parallel_alpha_beta(position, depth, max_player, game, workers=None, progress=None):
+    return root_split(ALPHA_BETA, position, depth, max_player, game, workers, progress)
+
+def parallel_minimax(position, depth, max_player, game, workers=None, progress=None):
+    return root_split(MINIMAX, position, depth, max_player, game, workers, progress)
+
+def root_split(algorithm, position, depth, max_player, game, workers=None, progress=None):
+    # Same result shape as the serial searches: (evaluation, board after the best move)
+    if progress is not None:
+        progress.depth = depth
+        progress.node()
+    color = WHITE if max_player else RED
+    moves = position.legal_moves(color)
+    if depth == 0 or position.winner() is not None or not moves:
+        return position.evaluate(), position
+
+    tt = game.tt if game is not None else None
+    key = tt_key(position, color)
+    if tt is not None:
+        # Best move of an earlier search first, it gives its brothers the tightest bound
+        entry = tt.probe(key)
+        if entry is not None and entry.move in moves:
+            moves.remove(entry.move)
+            moves.insert(0, entry.move)
+
+    executor = get_executor(workers)
+    state = board_state(position)
+    max_player = bool(max_player)
+    alpha, beta = float('-inf'), float('inf')
+    if algorithm == ALPHA_BETA:
+        first = run_tasks(executor, [(algorithm, state, moves[0], depth, max_player, alpha, beta)], progress)
+        if max_player:
+            alpha = first[0]
+        else:
+            beta = first[0]
+        rest = run_tasks(executor, [(algorithm, state, move, depth, max_player, alpha, beta)
+                                    for move in moves[1:]], progress)
+        scores = first + rest
+    else:
+        scores = run_tasks(executor, [(algorithm, state, move, depth, max_player, alpha, beta)
+                                      for move in moves], progress)
+
+    # A younger brother that failed low only has a bound, so it has to beat the best strictly
+    best_move, best_eval = moves[0], scores[0]
+    for move, evaluation in zip(moves[1:], scores[1:]):
+        if (evaluation > best_eval) if max_player else (evaluation < best_eval):
+            best_move, best_eval = move, evaluation
+    if progress is not None:
+        progress.best_move = best_move
+    if tt is not None:
+        tt.store(key, depth, best_eval, EXACT, best_move)
+    return best_eval, simulate_move(position, best_move)
+
+def run_tasks(executor, tasks, progress=None, function=None):
+    # Results of function (default search_move) in task order. Workers return
+    # (result, nodes); nodes are counted and waiting stops if the search is cancelled
+    futures = [executor.submit(function or search_move, task) for task in tasks]
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        if progress is not None:
+            for future in done:
+                progress.nodes += future.result()[1]
+            if progress.cancelled:
+                # Tasks already running finish in the background and are ignored
+                for future in pending:
+                    future.cancel()
+                raise SearchCancelled
+    return [future.result()[0] for future in futures]
+
+def search_move(task):
+    """Worker side: score one root move. The task holds only ints, floats and tuples."""
+    algorithm, state, move, depth, max_player, alpha, beta = task
+    board = state_board(state)
+    board.make_move(move)
+    if algorithm not in _tables:
+        _tables[algorithm] = TranspositionTable()
+    tt = _tables[algorithm]
+    progress = SearchProgress()
+    if algorithm == ALPHA_BETA:
+        evaluation = alpha_beta_search(board, depth - 1, not max_player, progress, alpha, beta,
+                                       tt, MoveOrderer(), 1)[0]
+    else:
+        evaluation = minimax_search(board, depth - 1, not max_player, progress, tt, 1)[0]
+    return evaluation, progress.nodes
+
+def simulate_move(board, move):
+    # Board after the chosen move; the searched board itself is left untouched
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
+
+def board_state(board):
+    # The board as ints and tuples for a task, with what Board.is_draw needs: the quiet
+    # plies and the hashes since the last capture or man move, the only ones that can repeat
+    recent = board.history[len(board.history) - min(board.quiet_plies, len(board.history)):]
+    return board.position.red, board.position.white, board.position.kings, board.quiet_plies, tuple(recent)
+
+def state_board(state):
+    # Worker side: the Board a task was made from
+    red, white, kings, quiet_plies, recent = state
+    board = Board.from_position(Position(red, white, kings))
+    board.quiet_plies = quiet_plies
+    board.history = list(recent)
+    return board
+
+def benchmark(depth=6, max_workers=DEFAULT_WORKERS, algorithm=ALPHA_BETA):
+    """Time one search from the opening for 1..max_workers workers against the serial search."""
+    board = Board()
+    serial = alpha_beta_pruning if algorithm == ALPHA_BETA else minimax
+    parallel = parallel_alpha_beta if algorithm == ALPHA_BETA else parallel_minimax
+    progress = SearchProgress()
+    start = time.perf_counter()
+    value = serial(board, depth, True, None, tt=TranspositionTable(), progress=progress)[0]
+    baseline = time.perf_counter() - start
+    print(f"{algorithm} depth {depth} from the opening")
+    print(f"{'workers':>7} {'seconds':>8} {'speedup':>8} {'nodes':>9}  value")
+    print(f"{'serial':>7} {baseline:8.2f} {1.0:8.2f} {progress.nodes:9d}  {value}")
+    for workers in range(1, max_workers + 1):
+        # Fresh pool and tables every time, and started before the clock runs
+        shutdown()
+        list(get_executor(workers).map(abs, range(workers)))
+        progress = SearchProgress()
+        start = time.perf_counter()
+        value = parallel(board, depth, True, None, workers=workers, progress=progress)[0]
+        elapsed = time.perf_counter() - start
+        print(f"{workers:7d} {elapsed:8.2f} {baseline / elapsed:8.2f} {progress.nodes:9d}  {value}")
+    shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Speedup of the root-split parallel search per worker count")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="largest worker count to try")
+    parser.add_argument("--algorithm", choices=[ALPHA_BETA, MINIMAX], default=ALPHA_BETA)
+    args = parser.parse_args()
+    benchmark(args.depth, args.workers, args.algorithm)
@@ -0,0 +1,95 @@
+"""
+Parallel Monte Carlo Tree Search on the worker pools of algorithm.parallel.
+
+Root parallelization: every worker builds its own tree from the same
+position with its own random stream, and the root visit counts are summed.
+Tree parallelization: one shared tree in this process; a batch of leaves is
+selected with a virtual loss on each path, so the batch spreads over
+different lines, and their rollouts run on the workers.
+
+Both take iterations per worker, so the total work grows with the pool,
+and an optional time_limit in milliseconds that is wall time for the pool
+as a whole. Given a seed, the random streams of the workers and of every
+rollout are drawn from it and results are merged in a fixed order, so
+without a time limit the chosen move does not depend on timing.
+"""
+import random
+import time
+from copy import deepcopy
+
+from algorithm.mcts import MCTSNode, search, select_leaf, pick_move, most_visited
+from algorithm.rollout import rollout
+from algorithm.parallel import DEFAULT_WORKERS, get_executor, run_tasks, board_state, state_board
+
+def root_parallel_mcts(board, turn, iterations=500, workers=None, seed=None, progress=None, time_limit=None):
+    if board.winner():
+        return None
+    workers = workers or DEFAULT_WORKERS
+    rng = random.Random(seed) if seed is not None else random
+    state = board_state(board)
+    tasks = [(state, turn, iterations, time_limit, rng.getrandbits(64)) for _ in range(workers)]
+    trees = run_tasks(get_executor(workers), tasks, progress, build_tree)
+
+    visits = {}
+    for tree in trees:
+        for move, count in tree:
+            visits[move] = visits.get(move, 0) + count
+    return pick_move(board, turn, visits, rng)
+
+def tree_parallel_mcts(board, turn, iterations=500, workers=None, seed=None, progress=None,
+                       virtual_loss=1, time_limit=None, tree=None):
+    if board.winner():
+        return None
+    workers = workers or DEFAULT_WORKERS
+    rng = random.Random(seed) if seed is not None else random
+    executor = get_executor(workers)
+    # The shared tree lives in this process, so it can be carried over like mcts_move's
+    root = tree.root_for(board, turn) if tree is not None else MCTSNode(deepcopy(board), turn)
+    deadline = time.perf_counter() + time_limit / 1000 if time_limit is not None else None
+
+    remaining = iterations * workers if iterations is not None else None
+    while remaining is None or remaining > 0:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        leaves = []
+        for _ in range(workers if remaining is None else min(workers, remaining)):
+            if progress is not None:
+                progress.node()  # One node per iteration
+            node = select_leaf(root)
+            add_virtual_loss(node, virtual_loss)
+            leaves.append(node)
+
+        # Terminal leaves are backed up as they are; only the others need a rollout
+        tasks = [(board_state(node.board), node.turn, rng.getrandbits(64)) for node in leaves if not node.terminal]
+        played = iter(run_tasks(executor, tasks, progress, play_rollout))
+        winners = [node.board.winner() if node.terminal else next(played) for node in leaves]
+        # Back up in selection order so the tree does not depend on which rollout finished first
+        for node, winner in zip(leaves, winners):
+            add_virtual_loss(node, -virtual_loss)
+            node.backpropagate(winner)
+        if progress is not None:
+            progress.best_move = most_visited(root)
+        if remaining is not None:
+            remaining -= len(leaves)
+
+    return pick_move(board, turn, {child.move: child.visits for child in root.children}, rng)
+
+def add_virtual_loss(node, amount):
+    # Count pending rollouts as lost visits along the path so UCB looks elsewhere
+    while node is not None:
+        node.visits += amount
+        node = node.parent
+
+def build_tree(task):
+    """Worker side: one independent tree; returns its root visit counts."""
+    state, turn, iterations, time_limit, seed = task
+    board = state_board(state)
+    root = search(board, turn, iterations, rng=random.Random(seed), time_limit=time_limit)
+    return [(child.move, child.visits) for child in root.children], root.visits
+
+def play_rollout(task):
+    """Worker side: one rollout; returns the winner."""
+    state, turn, seed = task
+    board = state_board(state)
+    # Iterations are counted by the caller
+    return rollout(board, turn, rng=random.Random(seed)), 0
@@ -0,0 +1,33 @@
+from copy import deepcopy
+from algorithm.transposition import tt_key
+
+def ponder(board, color, search, tt=None, results=None, progress=None):
+    """
+    Search on the opponent's time.
+
+    Plays each move color could make on board and runs
+    search(board_after_move, progress) on the resulting position, storing
+    the answer in results keyed by that position's hash. Once the opponent
+    has moved, an entry for board.hash is the reply to play straight away.
+    The move the transposition table expects color to play is searched
+    first; the searches also fill the table, which speeds up a fresh search
+    after an unexpected move.
+
+    Meant to run in a BackgroundSearch and be cancelled when the opponent
+    moves, so results only ever holds finished searches.
+    """
+    if results is None:
+        results = {}
+    moves = board.legal_moves(color)
+    entry = tt.probe(tt_key(board, color)) if tt is not None else None
+    if entry is not None and entry.move in moves:
+        # Predicted move first
+        moves.remove(entry.move)
+        moves.insert(0, entry.move)
+
+    for move in moves:
+        new_board = deepcopy(board)
+        new_board.make_move(move)
+        if new_board.hash not in results:
+            results[new_board.hash] = search(new_board, progress)
+    return results
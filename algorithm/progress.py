@@ -0,0 +1,51 @@
+import time
+
+class SearchCancelled(Exception):
+    pass
+
+class SearchProgress:
+    """
+    Node counter with an optional, rate-limited progress callback.
+
+    Searches call node() once for every position they visit. If a callback
+    is given it is called with this object at most max_rate times per
+    second, and can read nodes, depth, best_move (when the search knows
+    it), elapsed and nodes_per_second. Without a callback the only cost
+    is the counter increment, so headless searches never touch a display.
+
+    cancel() may be called from another thread; the search then stops at
+    its next node by raising SearchCancelled.
+    """
+    CHECK_EVERY = 64  # Nodes between clock reads
+
+    def __init__(self, callback=None, max_rate=10):
+        self.callback = callback
+        self.interval = 1.0 / max_rate
+        self.nodes = 0
+        self.depth = 0
+        self.best_move = None
+        self.cancelled = False
+        self.start = time.perf_counter()
+        self.next_report = self.start + self.interval
+
+    def node(self):
+        if self.cancelled:
+            raise SearchCancelled
+        self.nodes += 1
+        if self.callback is not None and self.nodes % self.CHECK_EVERY == 0:
+            now = time.perf_counter()
+            if now >= self.next_report:
+                self.next_report = now + self.interval
+                self.callback(self)
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    @property
+    def nodes_per_second(self):
+        elapsed = self.elapsed
+        return self.nodes / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,135 @@
+"""
+Rollout engine for MCTS.
+
+A rollout plays on a copy of the bitboard Position, not on the Board, so
+there is no hash to update, no Piece grid and nothing to undo. Captures
+come off with the move (make_move clears the captured squares). The side
+to move has lost once it has no legal moves, which also covers having no
+pieces left; that falls out of the move generation every ply needs anyway,
+so spotting the end of the game costs nothing extra. Once few enough
+pieces are left, the endgame tablebase (if one has been built) gives the
+result directly. Games that run past max_depth plies are scored on
+material instead of being played out, and the move-count rule (and a
+repetition already on the board) ends a rollout in a draw.
+
+The move choice is a policy, a function (position, turn, moves, rng) ->
+move; weighted_policy is the capture / promotion / advance heuristic MCTS
+has always used and random_policy is a uniform baseline.
+
+Run python -m algorithm.rollout to measure rollouts per second.
+"""
+import argparse
+import random
+import time
+
+from checkers.constants import RED, WHITE, DRAW_QUIET_PLIES
+from checkers.bitboard import TOP_ROW, BOTTOM_ROW, popcount, row_col
+from checkers.board import Board
+from checkers.tablebase import DRAW, WIN, load
+
+# Plies before a rollout is scored by material
+ROLLOUT_LIMIT = 200
+
+# Men always move one row forward when they do not capture
+MAN_WEIGHT = 1.0 + 0.3 * 1
+# Kings prefer the centre of the board
+KING_WEIGHTS = [1.0 + 0.2 * (4 - abs(3.5 - col) - abs(3.5 - row))
+                for row, col in (row_col(sq) for sq in range(32))]
+
+def weighted_policy(position, turn, moves, rng):
+    # Step 1: Always capture when possible
+    captures = [move for move in moves if move[2]]
+    if captures:
+        return rng.choice(captures)
+
+    # Step 2: Crown a man when possible (Red is crowned on the top row, White on the bottom row)
+    kings = position.kings
+    crowning_row = TOP_ROW if turn == RED else BOTTOM_ROW
+    promotions = [move for move in moves if not kings & (1 << move[0]) and (1 << move[1]) & crowning_row]
+    if promotions:
+        return rng.choice(promotions)
+
+    # Step 3: Weighted random choice, advancing men and centralised kings first
+    weights = [KING_WEIGHTS[move[1]] if kings & (1 << move[0]) else MAN_WEIGHT for move in moves]
+    r = rng.uniform(0, sum(weights))
+    cumulative_weight = 0
+    for move, weight in zip(moves, weights):
+        cumulative_weight += weight
+        if cumulative_weight >= r:
+            return move
+    return moves[-1]
+
+def random_policy(position, turn, moves, rng):
+    return rng.choice(moves)
+
+def material_winner(position):
+    # Side ahead on material (men 1, kings 3), None when level
+    red = popcount(position.red) + 2 * popcount(position.red & position.kings)
+    white = popcount(position.white) + 2 * popcount(position.white & position.kings)
+    if red > white:
+        return RED
+    if white > red:
+        return WHITE
+    return None
+
+def rollout(board, turn, max_depth=ROLLOUT_LIMIT, rng=random, policy=weighted_policy, stats=None):
+    """
+    Play a game out from board with turn to move and return the winner,
+    or None for a draw. board is left untouched. rng is anything with
+    choice() and uniform(), so seeded searches are repeatable. If stats is
+    a dict, the number of plies played is added to stats["plies"].
+    """
+    position = board.position.copy()
+    table = load()
+    quiet_plies = board.quiet_plies
+    for depth in range(max_depth):
+        if quiet_plies >= DRAW_QUIET_PLIES or depth == 0 and board.is_draw():
+            winner = None
+            break
+        entry = table.probe(position, turn) if table is not None else None
+        if entry is not None:
+            result = entry[0]
+            winner = None if result == DRAW else turn if result == WIN else RED if turn == WHITE else WHITE
+            break
+        moves = position.moves(turn)
+        if not moves:
+            winner = RED if turn == WHITE else WHITE
+            break
+        move = policy(position, turn, moves, rng)
+        if move[2] or not position.kings & (1 << move[0]):
+            quiet_plies = 0
+        else:
+            quiet_plies += 1
+        position.make_move(move)
+        turn = RED if turn == WHITE else WHITE
+    else:
+        depth = max_depth
+        winner = material_winner(position)
+    if stats is not None:
+        stats["plies"] = stats.get("plies", 0) + depth
+    return winner
+
+def benchmark(seconds=2.0, seed=0, max_depth=ROLLOUT_LIMIT):
+    """Rollouts per second from the opening for each policy."""
+    board = Board()
+    for name, policy in (("weighted", weighted_policy), ("random", random_policy)):
+        rng = random.Random(seed)
+        stats = {}
+        rollouts = capped = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            plies = stats.get("plies", 0)
+            rollout(board, RED, max_depth, rng, policy, stats)
+            capped += stats["plies"] - plies == max_depth
+            rollouts += 1
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8}: {rollouts / elapsed:8.1f} rollouts/s, "
+              f"{stats['plies'] / rollouts:5.1f} plies on average, {capped} of {rollouts} capped")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rollouts per second of the MCTS rollout engine")
+    parser.add_argument("--seconds", type=float, default=2.0, help="time per policy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-depth", type=int, default=ROLLOUT_LIMIT)
+    args = parser.parse_args()
+    benchmark(args.seconds, args.seed, args.max_depth)
@@ -0,0 +1,72 @@
+from collections import namedtuple
+from checkers.constants import WHITE
+from checkers.zobrist import WHITE_TO_MOVE
+
+# Bound types for stored scores
+EXACT, LOWER, UPPER = 0, 1, 2
+
+TTEntry = namedtuple("TTEntry", ["key", "depth", "score", "flag", "move"])
+
+def tt_key(board, color):
+    # Board.hash only covers the pieces, mix in the side to move
+    return board.hash ^ WHITE_TO_MOVE if color == WHITE else board.hash
+
+class TranspositionTable:
+    """
+    Bounded table of search results keyed by Zobrist hash.
+
+    Each bucket has two slots: a depth-preferred slot that only gives way to
+    an equal or deeper search, and an always-replace slot that takes
+    everything else. A Game keeps one table for its whole life so results
+    carry over from one AI move to the next.
+    """
+    def __init__(self, size=1 << 16):
+        # Number of buckets, rounded up to a power of two
+        self.size = 1 << max(size - 1, 1).bit_length()
+        self.mask = self.size - 1
+        self.clear()
+
+    def clear(self):
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+        self.hits = 0
+        self.misses = 0
+        # Probes whose bucket was occupied by other positions
+        self.collisions = 0
+        self.stores = 0
+
+    def probe(self, key):
+        index = key & self.mask
+        deep, recent = self.deep[index], self.recent[index]
+        if deep is not None and deep.key == key:
+            self.hits += 1
+            return deep
+        if recent is not None and recent.key == key:
+            self.hits += 1
+            return recent
+        self.misses += 1
+        if deep is not None or recent is not None:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, flag, move=None):
+        index = key & self.mask
+        entry = TTEntry(key, depth, score, flag, move)
+        deep = self.deep[index]
+        self.stores += 1
+        if deep is None or deep.key == key or depth >= deep.depth:
+            self.deep[index] = entry
+        else:
+            self.recent[index] = entry
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "size": self.size,
+            "used": sum(entry is not None for entry in self.deep) + sum(entry is not None for entry in self.recent),
+            "stores": self.stores,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
@@ -0,0 +1,187 @@
+"""
+Headless benchmarks for the rules engine and every AI algorithm.
+
+Runs perft from the fixed positions in checkers.perft, then each search
+algorithm at increasing depths (MCTS for a fixed number of iterations)
+and records nodes, time, nodes per second and peak memory. The results
+are written as JSON so runs from two commits can be compared:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --baseline before.json
+
+Searches are seeded and use a fresh transposition table every time, so
+node counts are repeatable and only the timings move between runs.
+Peak memory is measured in a second run under tracemalloc, which is slow;
+--no-memory skips it.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+from checkers.board import Board
+from checkers.constants import WHITE
+from checkers.perft import POSITIONS, perft
+from algorithm.alpha_beta_pruning import alpha_beta_pruning
+from algorithm.expectimax import expectimax
+from algorithm.iddfs import iddfs
+from algorithm.mcts import mcts_move
+from algorithm.minimax import minimax
+from algorithm.negamax import negamax
+from algorithm.progress import SearchProgress
+from algorithm.transposition import TranspositionTable
+
+SEED = 0
+# Positions the searches run from, by name in checkers.perft.POSITIONS
+SEARCH_POSITIONS = ["start", "midgame"]
+
+# Maximum depth (iterations for MCTS) per algorithm, full run and --quick run
+SEARCHES = {
+    "minimax": (4, 3),
+    "alpha_beta_pruning": (6, 4),
+    "iddfs": (6, 4),
+    "negamax": (5, 3),
+    "expectimax": (4, 3),
+    "mcts_move": (300, 50),
+}
+
+def run_search(algorithm, board, color, depth, progress):
+    max_player = color == WHITE
+    if algorithm == "minimax":
+        return minimax(board, depth, max_player, None, tt=TranspositionTable(), progress=progress)[0]
+    if algorithm == "alpha_beta_pruning":
+        return alpha_beta_pruning(board, depth, max_player, None, tt=TranspositionTable(), progress=progress)[0]
+    if algorithm == "iddfs":
+        # No time limit, so the search runs through every depth up to depth
+        return iddfs(board, depth, max_player, None, tt=TranspositionTable(), time_limit=float('inf'),
+                     progress=progress)[0]
+    if algorithm == "negamax":
+        return negamax(board, depth, color, None, tt=TranspositionTable(), progress=progress)[0]
+    if algorithm == "expectimax":
+        return expectimax(board, depth, max_player, None, progress=progress)[0]
+    if algorithm == "mcts_move":
+        move = mcts_move(board, color, depth, progress=progress, seed=SEED)
+        return None if move is None else [move[0].row, move[0].col, *move[1]]
+    raise ValueError(f"unknown algorithm {algorithm}")
+
+def measure(function, memory):
+    # (result, seconds, peak KiB or None); memory is measured in a separate run
+    random.seed(SEED)
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        random.seed(SEED)
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def bench_perft(depth, memory):
+    results = []
+    for name, position, color in POSITIONS:
+        for d in range(1, depth + 1):
+            nodes, elapsed, peak = measure(lambda: perft(position.copy(), color, d), memory)
+            results.append({
+                "position": name,
+                "depth": d,
+                "nodes": nodes,
+                "seconds": round(elapsed, 6),
+                "nodes_per_second": round(nodes / elapsed) if elapsed else None,
+                "peak_memory_kb": peak,
+            })
+            print(f"perft {name:>8} depth {d}: {nodes:9d} nodes {elapsed:8.3f}s")
+    return results
+
+def bench_searches(quick, memory, algorithms):
+    positions = {name: (position, color) for name, position, color in POSITIONS}
+    results = []
+    for algorithm in algorithms:
+        limit = SEARCHES[algorithm][1 if quick else 0]
+        # MCTS runs once for its iteration count, the others at every depth up to the limit
+        depths = [limit] if algorithm == "mcts_move" else range(1, limit + 1)
+        for name in SEARCH_POSITIONS:
+            position, color = positions[name]
+            for depth in depths:
+                progress = SearchProgress()
+
+                def search():
+                    progress.nodes = 0
+                    return run_search(algorithm, Board.from_position(position.copy()), color, depth, progress)
+
+                value, elapsed, peak = measure(search, memory)
+                nodes = progress.nodes
+                results.append({
+                    "algorithm": algorithm,
+                    "position": name,
+                    "depth": depth,
+                    "nodes": nodes,
+                    "seconds": round(elapsed, 6),
+                    "nodes_per_second": round(nodes / elapsed) if elapsed else None,
+                    "peak_memory_kb": peak,
+                    "value": value,
+                })
+                print(f"{algorithm:>18} {name:>8} depth {depth:3d}: {nodes:8d} nodes {elapsed:8.3f}s "
+                      f"{nodes / elapsed if elapsed else 0:10.0f} nodes/s")
+    return results
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def key(entry):
+    return (entry.get("algorithm", "perft"), entry["position"], entry["depth"])
+
+def compare(results, baseline, threshold):
+    """Print entries whose node count changed or that got slower than threshold (a ratio)."""
+    old = {key(entry): entry for entry in baseline["perft"] + baseline["searches"]}
+    regressions = 0
+    for entry in results["perft"] + results["searches"]:
+        before = old.get(key(entry))
+        if before is None:
+            continue
+        name = " ".join(str(part) for part in key(entry))
+        if entry["nodes"] != before["nodes"]:
+            print(f"{name}: nodes {before['nodes']} -> {entry['nodes']}")
+        if before["seconds"] and entry["seconds"] / before["seconds"] > threshold:
+            print(f"{name}: {before['seconds']:.3f}s -> {entry['seconds']:.3f}s")
+            regressions += 1
+    print(f"{regressions} timing regressions over {threshold:.2f}x")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft and search benchmarks")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    parser.add_argument("--perft-depth", type=int, default=5)
+    parser.add_argument("--algorithms", nargs="+", choices=list(SEARCHES), default=list(SEARCHES))
+    parser.add_argument("--quick", action="store_true", help="shallower searches")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    args = parser.parse_args()
+
+    memory = not args.no_memory
+    results = {
+        "commit": commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "perft": bench_perft(args.perft_depth, memory),
+        "searches": bench_searches(args.quick, memory, args.algorithms),
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            compare(results, json.load(baseline), args.threshold)
+
+if __name__ == "__main__":
+    main()
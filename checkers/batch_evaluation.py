@@ -0,0 +1,112 @@
+"""
+Board.evaluate for many positions at once with NumPy.
+
+Positions come either as an (N, 32) int8 array, one entry per dark square
+in bitboard order (0 empty, 1 red man, 2 red king, -1 white man, -2 white
+king), or packed as an (N, 3) integer array of (red, white, kings) masks.
+The score is the heuristic of checkers.evaluation term for term, with the
+same floating point operations, so every entry equals evaluate() exactly.
+
+The shift helpers in checkers.bitboard work unchanged on int64 arrays, so
+the move tests run on all N positions at once. A piece counts as
+vulnerable when an opponent next to it may jump it, i.e. it moves that way
+and the square behind the piece is empty; chain captures add nothing,
+since the old two-square radius around the jumping piece only ever
+reaches pieces taken by the first jump.
+
+NumPy is only needed by this module.
+"""
+import numpy as np
+
+from .bitboard import FULL, UP, DOWN
+from .evaluation import BACK, advancement
+
+SQUARE_BITS = np.left_shift(np.int64(1), np.arange(32, dtype=np.int64))
+
+RED_WIN, WHITE_WIN = -10000, 10000
+
+if hasattr(np, "bitwise_count"):
+    def popcount(masks):
+        return np.bitwise_count(masks).astype(np.int64)
+else:  # NumPy < 2.0
+    _BYTE_COUNTS = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+    def popcount(masks):
+        return sum(_BYTE_COUNTS[(masks >> shift) & 0xFF] for shift in (0, 8, 16, 24))
+
+def pack(boards):
+    """(N, 32) int8 square array -> (N, 3) int64 array of (red, white, kings) masks."""
+    boards = np.asarray(boards)
+    red = np.where(boards > 0, SQUARE_BITS, 0).sum(axis=1)
+    white = np.where(boards < 0, SQUARE_BITS, 0).sum(axis=1)
+    kings = np.where(np.abs(boards) == 2, SQUARE_BITS, 0).sum(axis=1)
+    return np.stack([red, white, kings], axis=1)
+
+def unpack(bitboards):
+    """(N, 3) masks -> (N, 32) int8 square array."""
+    bitboards = np.asarray(bitboards, dtype=np.int64)
+    red, white, kings = ((bitboards[:, [i]] & SQUARE_BITS) != 0 for i in range(3))
+    boards = red.astype(np.int8) - white.astype(np.int8)
+    return boards * np.where(kings, 2, 1).astype(np.int8)
+
+def from_positions(positions):
+    """Pack Position objects (or Boards) into an (N, 3) array."""
+    positions = [getattr(position, "position", position) for position in positions]
+    return np.array([(p.red, p.white, p.kings) for p in positions], dtype=np.int64).reshape(-1, 3)
+
+def has_moves(own, opp, kings, forward, backward):
+    empty = ~(own | opp) & FULL
+    found = np.zeros(own.shape, dtype=bool)
+    for steps, movers in ((forward, own), (backward, own & kings)):
+        for step in steps:
+            found |= (step(movers) & empty) != 0
+            found |= (step(step(movers) & opp) & empty) != 0
+    return found
+
+def vulnerable(own, opp, kings, opp_forward, opp_backward):
+    # Pieces in own that an adjacent opponent piece can jump
+    empty = ~(own | opp) & FULL
+    attacked = np.zeros_like(own)
+    for steps, movers in ((opp_forward, opp), (opp_backward, opp & kings)):
+        for step in steps:
+            attacked |= step(movers) & own & BACK[step](empty)
+    return attacked
+
+def evaluate_batch(positions):
+    """
+    Scores of N positions, given as an (N, 32) int8 square array or an
+    (N, 3) array of bitboard masks. Positive favors White, as Board.evaluate.
+    """
+    positions = np.asarray(positions)
+    if positions.ndim != 2 or positions.shape[1] not in (3, 32):
+        raise ValueError(f"expected an (N, 32) or (N, 3) array, got shape {positions.shape}")
+    bitboards = pack(positions) if positions.shape[1] == 32 else positions.astype(np.int64)
+    red, white, kings = bitboards[:, 0], bitboards[:, 1], bitboards[:, 2]
+
+    score = popcount(white) - popcount(red)
+    score += 2 * (popcount(white & kings) - popcount(red & kings))
+    white_position_score = advancement(white & ~kings, range(7, -1, -1), popcount)
+    red_position_score = advancement(red & ~kings, range(8), popcount)
+    score = score + (white_position_score - red_position_score) * 0.1
+    white_vulnerable = popcount(vulnerable(white, red, kings, UP, DOWN))
+    red_vulnerable = popcount(vulnerable(red, white, kings, DOWN, UP))
+    score += (red_vulnerable - white_vulnerable) * 0.5
+
+    # Terminal positions, checked in the order of Position.winner
+    red_moves = has_moves(red, white, kings, UP, DOWN)
+    white_moves = has_moves(white, red, kings, DOWN, UP)
+    score = np.where(~white_moves, RED_WIN, score)
+    score = np.where(~red_moves, WHITE_WIN, score)
+    score = np.where(white == 0, RED_WIN, score)
+    score = np.where(red == 0, WHITE_WIN, score)
+    return score
+
+def evaluate_moves(board, moves):
+    """Scores of the positions after each of moves, e.g. a depth-1 frontier, in one call."""
+    position = board.position
+    bitboards = np.empty((len(moves), 3), dtype=np.int64)
+    for i, move in enumerate(moves):
+        token = position.make_move(move)
+        bitboards[i] = position.red, position.white, position.kings
+        position.unmake_move(token)
+    return evaluate_batch(bitboards)
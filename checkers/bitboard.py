@@ -0,0 +1,229 @@
+"""
+Compact bitboard position used as the engine core behind Board.
+
+Only the 32 dark squares are playable, so they are numbered row by row,
+four per row: square = row * 4 + col // 2. A position is three 32-bit
+masks (red pieces, white pieces and kings), which makes copying a node
+three integer assignments instead of a deepcopy of 64 squares of Piece
+objects.
+
+Red moves up the board (towards row 0), White moves down (towards row 7).
+A move is a (source, destination, captured_mask) tuple of square indices.
+"""
+from .constants import RED, WHITE
+
+FULL = 0xFFFFFFFF
+
+# Row and column masks used by the shift based neighbour lookups
+EVEN_ROWS = 0x0F0F0F0F  # rows 0, 2, 4, 6 (dark squares on columns 1, 3, 5, 7)
+ODD_ROWS = 0xF0F0F0F0   # rows 1, 3, 5, 7 (dark squares on columns 0, 2, 4, 6)
+LEFT_EDGE = 0x10101010  # column 0
+RIGHT_EDGE = 0x08080808 # column 7
+TOP_ROW = 0x0000000F
+BOTTOM_ROW = 0xF0000000
+PROMOTION = TOP_ROW | BOTTOM_ROW
+
+
+def square(row, col):
+    return row * 4 + col // 2
+
+
+def row_col(sq):
+    row = sq >> 2
+    return row, (sq & 3) * 2 + (1 - row % 2)
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+def squares(mask):
+    # Yield the square index of every set bit, lowest first
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+# One-step neighbours of every piece in a mask, one function per diagonal
+def up_left(mask):
+    return ((mask & EVEN_ROWS) >> 4) | ((mask & ODD_ROWS & ~LEFT_EDGE) >> 5)
+
+
+def up_right(mask):
+    return ((mask & EVEN_ROWS & ~RIGHT_EDGE) >> 3) | ((mask & ODD_ROWS) >> 4)
+
+
+def down_left(mask):
+    return (((mask & EVEN_ROWS) << 4) | ((mask & ODD_ROWS & ~LEFT_EDGE) << 3)) & FULL
+
+
+def down_right(mask):
+    return (((mask & EVEN_ROWS & ~RIGHT_EDGE) << 5) | ((mask & ODD_ROWS) << 4)) & FULL
+
+
+UP = (up_left, up_right)
+DOWN = (down_left, down_right)
+
+# Move tables, indexed [square][direction] with -1 off the board. Directions
+# are numbered in the order the original traversal tried them.
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = range(4)
+UP_DIRECTIONS = (UP_LEFT, UP_RIGHT)
+DOWN_DIRECTIONS = (DOWN_LEFT, DOWN_RIGHT)
+ALL_DIRECTIONS = UP_DIRECTIONS + DOWN_DIRECTIONS
+
+
+def _step(sq, direction):
+    target = (up_left, up_right, down_left, down_right)[direction](1 << sq) if sq >= 0 else 0
+    return target.bit_length() - 1
+
+
+# Neighbouring square and jump landing square in each direction
+NEIGHBOURS = [tuple(_step(sq, direction) for direction in ALL_DIRECTIONS) for sq in range(32)]
+JUMPS = [tuple(_step(NEIGHBOURS[sq][direction], direction) for direction in ALL_DIRECTIONS) for sq in range(32)]
+
+
+class Position:
+    __slots__ = ("red", "white", "kings")
+
+    def __init__(self, red=0, white=0, kings=0):
+        self.red = red
+        self.white = white
+        self.kings = kings
+
+    @classmethod
+    def initial(cls):
+        # White fills rows 0-2, Red fills rows 5-7
+        return cls(red=0xFFF00000, white=0x00000FFF)
+
+    def copy(self):
+        return Position(self.red, self.white, self.kings)
+
+    def __eq__(self, other):
+        return (isinstance(other, Position) and self.red == other.red
+                and self.white == other.white and self.kings == other.kings)
+
+    def __hash__(self):
+        return hash((self.red, self.white, self.kings))
+
+    def __repr__(self):
+        return f"Position(red={self.red:#010x}, white={self.white:#010x}, kings={self.kings:#010x})"
+
+    def pieces(self, color):
+        return self.red if color == RED else self.white
+
+    def color_at(self, sq):
+        bit = 1 << sq
+        if self.red & bit:
+            return RED
+        if self.white & bit:
+            return WHITE
+        return None
+
+    def piece_moves(self, sq):
+        """
+        Moves for the piece on square sq as {destination: captured_mask}.
+        Follows the original Board._traverse_left/_traverse_right rules
+        (see checkers.reference) so every search sees exactly the same
+        move lists as before.
+        """
+        bit = 1 << sq
+        if self.red & bit:
+            own, opp = self.red, self.white
+            directions = ALL_DIRECTIONS if self.kings & bit else UP_DIRECTIONS
+        elif self.white & bit:
+            own, opp = self.white, self.red
+            directions = ALL_DIRECTIONS if self.kings & bit else DOWN_DIRECTIONS
+        else:
+            return {}
+
+        occupied = own | opp
+        moves = {}
+        for direction in directions:
+            target = NEIGHBOURS[sq][direction]
+            if target < 0:
+                continue
+            if not occupied & (1 << target):
+                moves[target] = 0
+            elif opp & (1 << target):
+                landing = JUMPS[sq][direction]
+                if landing >= 0 and not occupied & (1 << landing):
+                    self._jumps(landing, 1 << target, direction in UP_DIRECTIONS, opp, occupied, moves)
+        return moves
+
+    def _jumps(self, landing, captured, upwards, opp, occupied, moves):
+        # A capture and its continuations, depth first with an explicit
+        # stack. As in the original traversal a chain keeps going in the
+        # same vertical direction, only the last two jumped pieces are
+        # reported as captured, and a continuation never lands on row 0.
+        directions = UP_DIRECTIONS if upwards else DOWN_DIRECTIONS
+        stack = [(landing, captured, captured)]
+        while stack:
+            sq, captured, jumped = stack.pop()
+            moves[sq] = captured
+            # Pushed in reverse so they come off the stack in direction order
+            for direction in reversed(directions):
+                target = NEIGHBOURS[sq][direction]
+                if target < 0 or not opp & (1 << target):
+                    continue
+                landing = JUMPS[sq][direction]
+                if landing < 0 or occupied & (1 << landing) or (upwards and landing < 4):
+                    continue
+                stack.append((landing, (1 << target) | jumped, 1 << target))
+
+    def moves(self, color):
+        moves = []
+        for sq in squares(self.pieces(color)):
+            for dst, captured in self.piece_moves(sq).items():
+                moves.append((sq, dst, captured))
+        return moves
+
+    def has_moves(self, color):
+        if color == RED:
+            own, opp, forward, backward = self.red, self.white, UP, DOWN
+        else:
+            own, opp, forward, backward = self.white, self.red, DOWN, UP
+        empty = ~(own | opp) & FULL
+        kings = own & self.kings
+        for step in forward:
+            if step(own) & empty or step(step(own) & opp) & empty:
+                return True
+        if kings:
+            for step in backward:
+                if step(kings) & empty or step(step(kings) & opp) & empty:
+                    return True
+        return False
+
+    def make_move(self, move):
+        """Apply move in place and return a token for unmake_move."""
+        src, dst, captured = move
+        token = (self.red, self.white, self.kings)
+        path = (1 << src) | (1 << dst)
+        if self.red & (1 << src):
+            self.red ^= path
+        else:
+            self.white ^= path
+        if self.kings & (1 << src):
+            self.kings ^= path
+        elif (1 << dst) & PROMOTION:
+            self.kings |= 1 << dst
+        if captured:
+            self.red &= ~captured
+            self.white &= ~captured
+            self.kings &= ~captured
+        return token
+
+    def unmake_move(self, token):
+        self.red, self.white, self.kings = token
+
+    def winner(self):
+        if not self.red:
+            return WHITE
+        if not self.white:
+            return RED
+        if not self.has_moves(RED):
+            return WHITE
+        if not self.has_moves(WHITE):
+            return RED
+        return None
+
@@ -1,78 +1,109 @@
-import pygame
-from .constants import BLACK, ROWS, RED, SQUARE_SIZE, COLS, WHITE
+from .constants import ROWS, RED, COLS, WHITE, DRAW_REPETITIONS, DRAW_QUIET_PLIES
 from .piece import Piece
+from .bitboard import Position, square, row_col, squares, popcount
+from . import zobrist, evaluation, notation
 
 class Board:
+    """
+    Thin adapter over a bitboard Position. The engine state lives in
+    self.position; the 8x8 grid of Piece objects used by the game and the
+    drawing code is only built when someone asks for it.
+    """
     def __init__(self):
-        # Setup board as an array
-        self.board = []
-        # Number of pieces on the board
-        self.red_left = self.white_left = 12
-        # Number of kings on the board
-        self.red_kings = self.white_kings = 0
+        # Grid of Piece objects, rebuilt lazily from the position
+        self._grid = None
         # Create Board
         self.create_board()
 
+    @classmethod
+    def from_position(cls, position):
+        # Board around an existing Position, e.g. one rebuilt in a worker process
+        board = cls.__new__(cls)
+        board.position = position
+        board.hash = zobrist.hash_position(position)
+        board.history = []
+        board.quiet_plies = 0
+        board._grid = None
+        return board
+
+    @classmethod
+    def from_fen(cls, text):
+        # (board, side to move) from PDN FEN text, see checkers.notation
+        position, turn = notation.from_fen(text)
+        return cls.from_position(position), turn
+
+    def to_fen(self, turn):
+        return notation.to_fen(self.position, turn)
+
+    @classmethod
+    def from_bytes(cls, data):
+        # (board, side to move) from a 16 byte record, see checkers.notation
+        position, turn, quiet_plies = notation.from_bytes(data)
+        board = cls.from_position(position)
+        board.quiet_plies = quiet_plies
+        return board, turn
+
+    def to_bytes(self, turn):
+        return notation.to_bytes(self.position, turn, self.quiet_plies)
+
+    def __deepcopy__(self, memo):
+        # Copying the position is enough, the grid is rebuilt on demand
+        board = Board.__new__(Board)
+        board.position = self.position.copy()
+        board.hash = self.hash
+        board.history = self.history.copy()
+        board.quiet_plies = self.quiet_plies
+        board._grid = None
+        return board
+
+    # Number of pieces on the board
+    @property
+    def red_left(self):
+        return popcount(self.position.red)
+
+    @property
+    def white_left(self):
+        return popcount(self.position.white)
+
+    # Number of kings on the board
+    @property
+    def red_kings(self):
+        return popcount(self.position.red & self.position.kings)
+
+    @property
+    def white_kings(self):
+        return popcount(self.position.white & self.position.kings)
+
+    @property
+    def board(self):
+        if self._grid is None:
+            self._grid = [[0] * COLS for _ in range(ROWS)]
+            for color in (WHITE, RED):
+                for sq in squares(self.position.pieces(color)):
+                    row, col = row_col(sq)
+                    piece = Piece(row, col, color)
+                    if self.position.kings & (1 << sq):
+                        piece.make_king()
+                    self._grid[row][col] = piece
+        return self._grid
+
     # Function to draw red and black patterns on a checker board
     def draw_squares(self, win):
-        # Fill window with black color
-        win.fill(BLACK)
-        # Loop through each row
-        for row in range(ROWS):
-            # Loop through each column, starting from 0 or 1 based on whether the row is even or odd.
-            # Loop will increment by 2, skipping alternate columns to create the checkered pattern.
-            for col in range(row % 2, COLS, 2):
-                # Draw red rectangle on the Pygame window
-                # rect(window, color, (top left x-coordinate, top left y-coordinate, width, height))
-                pygame.draw.rect(win, RED, (row*SQUARE_SIZE, col *SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+        from .drawing import draw_squares
+        draw_squares(win)
 
     def evaluate(self):
         """
         Evaluate the board state for search algorithms (Minimax, Alpha-Beta, IDDFS).
-        Positive score favors White, negative favors Red.
+        Positive score favors White, negative favors Red. See checkers.evaluation.
         """
-        score = 0
-        
-        # Check for a winner (terminal state)
-        winner = self.winner()
-        if winner == WHITE:
-            return 10000  # Large value for a win
-        elif winner == RED:
-            return -10000  # Large value for a loss
-        
-        # Piece count: regular pieces worth 1, kings worth 3
-        white_pieces = self.get_all_pieces(WHITE)
-        red_pieces = self.get_all_pieces(RED)
-        score += self.white_left - self.red_left  # Basic piece advantage
-        score += 2 * (self.white_kings - self.red_kings)  # Kings are worth more
-        
-        # Board control: favor pieces closer to the opponent's side
-        white_position_score = sum(7 - p.row for p in white_pieces if not p.king)  # White moves up (row decreases)
-        red_position_score = sum(p.row for p in red_pieces if not p.king)  # Red moves down (row increases)
-        score += (white_position_score - red_position_score) * 0.1  # Small weight to avoid overemphasis
-        
-        # Safety: penalize pieces that can be captured
-        white_vulnerable = sum(1 for p in white_pieces if self.is_vulnerable(p, WHITE))
-        red_vulnerable = sum(1 for p in red_pieces if self.is_vulnerable(p, RED))
-        score += (red_vulnerable - white_vulnerable) * 0.5  # Moderate penalty for vulnerability
-        
-        return score
+        return evaluation.evaluate(self.position)
 
     def is_vulnerable(self, piece, color):
         """
         Check if a piece is at risk of being captured by nearby opponent pieces.
         """
-        opponent_color = RED if color == WHITE else WHITE
-        opponent_pieces = self.get_all_pieces(opponent_color)
-        
-        # Only check pieces within 2 rows/cols (max jump distance in checkers)
-        for opp in opponent_pieces:
-            if abs(opp.row - piece.row) <= 2 and abs(opp.col - piece.col) <= 2:
-                opp_moves = self.get_valid_moves(opp)
-                for move, skip in opp_moves.items():
-                    if skip and piece in skip:  # If this piece can be jumped
-                        return True
-        return False
+        return bool(evaluation.vulnerable(self.position, color) & (1 << square(piece.row, piece.col)))
 
     def get_all_pieces(self, color):
         pieces = []
@@ -83,189 +114,100 @@ class Board:
         return pieces
 
     def move(self, piece, row, col):
-        self.board[piece.row][piece.col], self.board[row][col] = self.board[row][col], self.board[piece.row][piece.col]
+        self.make_move((square(piece.row, piece.col), square(row, col), 0))
         piece.move(row, col)
 
         if row == ROWS - 1 or row == 0:
             piece.make_king()
-            if piece.color == WHITE:
-                self.white_kings += 1
-            else:
-                self.red_kings += 1 
 
     def get_piece(self, row, col):
         return self.board[row][col]
 
     def create_board(self):
-        for row in range(ROWS):
-            # Creating an 2D array for the board
-            self.board.append([])
-            # insert pieces in each row
-            for col in range(COLS):
-                # Insert in alternating order
-                if col % 2 == ((row + 1) % 2):
-                    if row < 3:
-                        # White pieces will be inserted in row 0,1 and 2
-                        self.board[row].append(Piece(row, col, WHITE))
-                    elif row > 4:
-                        # Red pieces will be inserted in row 5,6,7
-                        self.board[row].append(Piece(row, col, RED))
-                    else:
-                        # Rest of the empty squares will be filled with 0
-                        self.board[row].append(0)
-                else:
-                    # Rest of the empty squares will be filled with 0
-                    self.board[row].append(0)
+        # White pieces fill rows 0, 1 and 2, red pieces fill rows 5, 6 and 7
+        self.position = Position.initial()
+        # Zobrist hash of the pieces, kept up to date by every move and capture
+        self.hash = zobrist.hash_position(self.position)
+        # Hashes of the positions before each move, and plies since the last capture or man move
+        self.history = []
+        self.quiet_plies = 0
+        self._grid = None
         
     # Method for rendering the board and pieces on the window.
     def draw(self, win):
-        # Call the draw_squares() method to draw the squares on the window
-        # This colors the squares to create the RED-BLACK pattern.
-        self.draw_squares(win)
-        # Loop for rendering all the pieces on the squares
-        for row in range(ROWS):
-            for col in range(COLS):
-                # Get the piece information located at each square
-                # piece = RED or BLACK or 0 ; three options
-                piece = self.board[row][col]
-                # Check if the piece 0 or the square is blank
-                if piece != 0:
-                    # If the square is not empty, 
-                    # call the draw method in the Piece class to render it on the window
-                    piece.draw(win)
+        from .drawing import draw_board
+        draw_board(win, self)
 
     def remove(self, pieces):
+        captured = 0
         for piece in pieces:
-            self.board[piece.row][piece.col] = 0
             if piece != 0:
-                if piece.color == RED:
-                    self.red_left -= 1
-                else:
-                    self.white_left -= 1
+                sq = square(piece.row, piece.col)
+                if self.position.color_at(sq) is not None:
+                    self.hash ^= zobrist.PIECE_KEYS[zobrist.piece_kind(self.position, sq)][sq]
+                    captured |= 1 << sq
+        self.position.red &= ~captured
+        self.position.white &= ~captured
+        self.position.kings &= ~captured
+        if captured:
+            self.quiet_plies = 0
+        self._grid = None
     
     def winner(self):
-        if self.red_left <= 0:
-            return WHITE
-        elif self.white_left <= 0:
-            return RED
-    
-    # Check if Red has no moves
-        red_pieces = self.get_all_pieces(RED)
-        red_has_moves = any(self.get_valid_moves(piece) for piece in red_pieces)
-        if not red_has_moves and red_pieces:  # Red has pieces but no moves
-            return WHITE
-    
-    # Check if White has no moves
-        white_pieces = self.get_all_pieces(WHITE)
-        white_has_moves = any(self.get_valid_moves(piece) for piece in white_pieces)
-        if not white_has_moves and white_pieces:  # White has pieces but no moves
-            return RED
-    
-        return None
+        return self.position.winner()
+
+    def is_draw(self):
+        """
+        True once the position has come up DRAW_REPETITIONS times with the
+        same side to move, or after DRAW_QUIET_PLIES plies without a capture
+        or a man moving.
+        """
+        if self.quiet_plies >= DRAW_QUIET_PLIES:
+            return True
+        # Captures and man moves can't be undone, so only positions since the last one can repeat
+        history = self.history
+        repetitions = 1
+        for back in range(2, min(self.quiet_plies, len(history)) + 1, 2):
+            if history[-back] == self.hash:
+                repetitions += 1
+        return repetitions >= DRAW_REPETITIONS
 
     # Method to get the dictionary of valid moves
     def get_valid_moves(self, piece):
-        # Initialize an empty dictionary to store valid moves
+        # Map destination squares to the list of pieces jumped on the way
         moves = {}
-        # Calculate the left column adjacent to the piece
-        left = piece.col - 1
-        # Calculate the right column adjacent to the piece
-        right = piece.col + 1
-        # Get the row of the piece
-        row = piece.row
-
-        if piece.color == RED or piece.king:
-            # Traverse left diagonals upwards
-            moves.update(self._traverse_left(row -1, max(row-3, -1), -1, piece.color, left))
-            # Traverse right diagonals upwards
-            moves.update(self._traverse_right(row -1, max(row-3, -1), -1, piece.color, right))
-        if piece.color == WHITE or piece.king:
-            # Traverse left diagonals downwards
-            moves.update(self._traverse_left(row +1, min(row+3, ROWS), 1, piece.color, left))
-            # Traverse right diagonals downwards
-            moves.update(self._traverse_right(row +1, min(row+3, ROWS), 1, piece.color, right))
-    
+        for dst, captured in self.position.piece_moves(square(piece.row, piece.col)).items():
+            moves[row_col(dst)] = [self.get_piece(*row_col(sq)) for sq in squares(captured)]
         return moves
 
-    def _traverse_left(self, start, stop, step, color, left, skipped=[]):
-        # Initialize an empty dictionary to store valid moves
-        moves = {}
-        # Initialize an empty list to keep track of pieces to be skipped
-        last = []
-        for r in range(start, stop, step):
-            # Check if the left column index is out of bounds
-            if left < 0:
-                break
-            # Get the current square on the board
-            current = self.board[r][left]
-            # Check if the current square is empty
-            if current == 0:
-                # If there are skipped pieces but no piece to capture, stop traversal
-                if skipped and not last:
-                    break
-                # If there are skipped pieces, add the move with the skipped pieces
-                elif skipped:
-                    moves[(r, left)] = last + skipped
-                # If no pieces are skipped, add the move normally
-                else:
-                    moves[(r, left)] = last
+    def legal_moves(self, color):
+        # Engine level moves as (source, destination, captured) square tuples
+        return self.position.moves(color)
 
-                # If there is a piece to be captured
-                if last:
-                    # Determine the next row based on the direction of movement
-                    if step == -1:
-                        row = max(r-3, 0)
-                    else:
-                        row = min(r+3, ROWS)
-                    # Recursively traverse left and right diagonals to find further valid moves
-                    moves.update(self._traverse_left(r+step, row, step, color, left-1, skipped=last))
-                    moves.update(self._traverse_right(r+step, row, step, color, left+1, skipped=last))
-                break
-            # If the current piece is the same color, stop traversal
-            elif current.color == color:
-                break
-            # If the current piece is of the opposite color, mark it as the last piece to be captured
-            else:
-                last = [current]
-            # Move to the next column on the left
-            left -= 1
-        # Return the dictionary of valid moves
-        return moves
-
-    def _traverse_right(self, start, stop, step, color, right, skipped=[]):
-        # Initialize an empty dictionary to store valid moves
-        moves = {}
-        # Initialize an empty list to keep track of pieces to be skipped
-        last = []
-        for r in range(start, stop, step):
-            if right >= COLS:
-                break
-            
-            current = self.board[r][right]
-            if current == 0:
-                if skipped and not last:
-                    break
-                elif skipped:
-                    moves[(r, right)] = last + skipped
-                else:
-                    moves[(r, right)] = last
-                
-                if last:
-                    if step == -1:
-                        row = max(r-3, 0)
-                    else:
-                        row = min(r+3, ROWS)
-                    moves.update(self._traverse_left(r+step, row, step, color, right-1, skipped=last))
-                    moves.update(self._traverse_right(r+step, row, step, color, right+1, skipped=last))
-                break
-            elif current.color == color:
-                break
-            else:
-                last = [current]
+    def make_move(self, move):
+        """
+        Apply an engine move in place. Returns an undo token that
+        unmake_move uses to restore pieces, captures, promotions, the
+        piece/king counts, the hash and the draw counters.
+        """
+        key = self.hash
+        quiet_plies = self.quiet_plies
+        if move[2] or not self.position.kings & (1 << move[0]):
+            self.quiet_plies = 0
+        else:
+            self.quiet_plies += 1
+        self.history.append(key)
+        self.hash ^= zobrist.move_delta(self.position, move)
+        token = (self.position.make_move(move), key, quiet_plies)
+        self._grid = None
+        return token
+
+    def unmake_move(self, token):
+        position_token, self.hash, self.quiet_plies = token
+        self.history.pop()
+        self.position.unmake_move(position_token)
+        self._grid = None
 
-            right += 1
-        
-        return moves     
     def get_all_valid_moves(self, turn):
         moves = {}
         for piece in self.get_all_pieces(turn):
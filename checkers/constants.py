@@ -1,5 +1,5 @@
 # constants.py
-import pygame
+# Plain values only: the crown image is loaded by checkers.drawing once a window exists
 
 WIDTH, HEIGHT = 800, 800  # Increased from 560x560
 ROWS, COLS = 8, 8
@@ -13,4 +13,7 @@ GREY = (128, 128, 128)
 BLUE = (0, 0, 255)
 GREEN = (0, 255, 0)
 
-CROWN = pygame.transform.scale(pygame.image.load('assets/crown.png'), (SQUARE_SIZE // 2, SQUARE_SIZE // 4))
\ No newline at end of file
+# Draw rules: the same position (and side to move) for the third time, or
+# 80 plies in a row without a capture or a man moving
+DRAW_REPETITIONS = 3
+DRAW_QUIET_PLIES = 80
@@ -0,0 +1,71 @@
+"""
+Pygame rendering layer for the board, pieces and move hints.
+
+The rules engine (bitboard, board, piece, game state) never imports this
+module at load time, so searches and batch workers run without pygame or
+a display. The crown image is loaded the first time a king is drawn.
+"""
+import pygame
+from .constants import BLACK, BLUE, GREY, RED, ROWS, COLS, SQUARE_SIZE
+
+# Padding and outline scale with SQUARE_SIZE
+PADDING = SQUARE_SIZE // 7  # Approx. 14 for SQUARE_SIZE=100, was 15
+OUTLINE = SQUARE_SIZE // 35  # Approx. 3 for SQUARE_SIZE=100, was 2
+
+_crown = None
+
+def get_crown():
+    global _crown
+    if _crown is None:
+        _crown = pygame.transform.scale(pygame.image.load('assets/crown.png'), (SQUARE_SIZE // 2, SQUARE_SIZE // 4))
+    return _crown
+
+# Function to draw red and black patterns on a checker board
+def draw_squares(win):
+    # Fill window with black color
+    win.fill(BLACK)
+    # Loop through each row
+    for row in range(ROWS):
+        # Loop through each column, starting from 0 or 1 based on whether the row is even or odd.
+        # Loop will increment by 2, skipping alternate columns to create the checkered pattern.
+        for col in range(row % 2, COLS, 2):
+            # Draw red rectangle on the Pygame window
+            # rect(window, color, (top left x-coordinate, top left y-coordinate, width, height))
+            pygame.draw.rect(win, RED, (row*SQUARE_SIZE, col *SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+
+def draw_piece(win, piece):
+    radius = SQUARE_SIZE // 2 - PADDING
+    pygame.draw.circle(win, GREY, (piece.x, piece.y), radius + OUTLINE)
+    pygame.draw.circle(win, piece.color, (piece.x, piece.y), radius)
+    if piece.king:
+        crown = get_crown()
+        win.blit(crown, (piece.x - crown.get_width() // 2, piece.y - crown.get_height() // 2))
+
+# Method for rendering the board and pieces on the window.
+def draw_board(win, board):
+    # Call draw_squares() to draw the squares on the window
+    # This colors the squares to create the RED-BLACK pattern.
+    draw_squares(win)
+    # Loop for rendering all the pieces on the squares
+    for row in range(ROWS):
+        for col in range(COLS):
+            # Get the piece information located at each square
+            # piece = RED or BLACK or 0 ; three options
+            piece = board.board[row][col]
+            # Check if the piece 0 or the square is blank
+            if piece != 0:
+                # If the square is not empty, render it on the window
+                draw_piece(win, piece)
+
+def draw_valid_moves(win, moves):
+    for move in moves:
+        row, col = move
+        pygame.draw.circle(win, BLUE, (col * SQUARE_SIZE + SQUARE_SIZE//2, row * SQUARE_SIZE + SQUARE_SIZE//2), 15)
+
+def draw_game(win, game, overlay=None):
+    draw_board(win, game.board)
+    draw_valid_moves(win, game.valid_moves)
+    # Anything drawn on top of the board, e.g. the AI's thinking indicator
+    if overlay is not None:
+        overlay()
+    pygame.display.update()
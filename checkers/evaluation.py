@@ -0,0 +1,105 @@
+"""
+Board.evaluate computed straight from the bitboards.
+
+The terms and the arithmetic are those of the original evaluation over the
+Piece grid: material, extra value for kings, advancement of men, and the
+number of pieces an opponent within two rows and columns could jump.
+Material and advancement are popcounts of the colour, king and row masks,
+so there is nothing to keep up to date in make_move. For vulnerability,
+shift masks find the pieces that have a capture at all and only those
+generate their moves, once each, instead of every piece generating the
+moves of every nearby opponent.
+
+evaluate_corpus.json holds positions scored by the original evaluation;
+python -m checkers.evaluation checks that evaluate() still agrees with it.
+"""
+import json
+import os
+
+from .constants import RED, WHITE
+from .bitboard import Position, popcount, row_col, squares, up_left, up_right, down_left, down_right, UP, DOWN, FULL
+
+CORPUS = os.path.join(os.path.dirname(__file__), "evaluate_corpus.json")
+
+ROW_MASKS = [0xF << (4 * row) for row in range(8)]
+
+# Squares within two rows and two columns of each square
+NEAR = [sum(1 << other for other in range(32)
+            if abs(row_col(other)[0] - row_col(sq)[0]) <= 2 and abs(row_col(other)[1] - row_col(sq)[1]) <= 2)
+        for sq in range(32)]
+
+# Step back along each diagonal
+BACK = {up_left: down_right, up_right: down_left, down_left: up_right, down_right: up_left}
+
+def jumpers(position, color):
+    # Pieces of color that can make at least one capture
+    if color == RED:
+        own, opp, forward, backward = position.red, position.white, UP, DOWN
+    else:
+        own, opp, forward, backward = position.white, position.red, DOWN, UP
+    empty = ~(own | opp) & FULL
+    found = 0
+    for steps, movers in ((forward, own), (backward, own & position.kings)):
+        for step in steps:
+            back = BACK[step]
+            found |= back(back(empty) & opp) & movers
+    return found
+
+def vulnerable(position, color):
+    # Pieces of color that an opponent piece within two rows and columns can capture
+    opponent = WHITE if color == RED else RED
+    attacked = 0
+    for sq in squares(jumpers(position, opponent)):
+        captured = 0
+        for mask in position.piece_moves(sq).values():
+            captured |= mask
+        attacked |= captured & NEAR[sq]
+    return attacked & position.pieces(color)
+
+def advancement(men, rows, count=popcount):
+    # count is the popcount to use; batch_evaluation passes one for NumPy arrays
+    return sum(row * count(men & ROW_MASKS[index]) for index, row in enumerate(rows))
+
+def evaluate(position):
+    """
+    Positive score favors White, negative favors Red.
+    """
+    score = 0
+
+    # Check for a winner (terminal state)
+    winner = position.winner()
+    if winner == WHITE:
+        return 10000  # Large value for a win
+    elif winner == RED:
+        return -10000  # Large value for a loss
+
+    red, white, kings = position.red, position.white, position.kings
+    # Piece count: regular pieces worth 1, kings worth 3
+    score += popcount(white) - popcount(red)  # Basic piece advantage
+    score += 2 * (popcount(white & kings) - popcount(red & kings))  # Kings are worth more
+
+    # Board control: White men on row r score 7 - r, Red men score r
+    white_position_score = advancement(white & ~kings, range(7, -1, -1))
+    red_position_score = advancement(red & ~kings, range(8))
+    score += (white_position_score - red_position_score) * 0.1  # Small weight to avoid overemphasis
+
+    # Safety: penalize pieces that can be captured
+    white_vulnerable = popcount(vulnerable(position, WHITE))
+    red_vulnerable = popcount(vulnerable(position, RED))
+    score += (red_vulnerable - white_vulnerable) * 0.5  # Moderate penalty for vulnerability
+
+    return score
+
+def check_corpus(path=CORPUS):
+    """Return the corpus entries whose score evaluate() no longer reproduces."""
+    with open(path) as corpus:
+        entries = json.load(corpus)
+    return [entry for entry in entries if evaluate(Position(*entry[:3])) != entry[3]]
+
+if __name__ == "__main__":
+    mismatches = check_corpus()
+    for red, white, kings, expected in mismatches:
+        position = Position(red, white, kings)
+        print(f"{position!r}: expected {expected}, got {evaluate(position)}")
+    print(f"{len(mismatches)} mismatches")
+    raise SystemExit(1 if mismatches else 0)
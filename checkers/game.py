@@ -1,16 +1,17 @@
-import pygame
-from .constants import RED, WHITE, BLUE, SQUARE_SIZE
+from .constants import RED, WHITE
 from checkers.board import Board
+from algorithm.transposition import TranspositionTable
+from algorithm.mcts import MCTSTree
 
 class Game:
     def __init__(self, win):
         self._init()
         self.win = win
     
-    def update(self):
-        self.board.draw(self.win)
-        self.draw_valid_moves(self.valid_moves)
-        pygame.display.update()
+    def update(self, overlay=None):
+        # pygame is only needed once there is a window, see checkers.drawing
+        from .drawing import draw_game
+        draw_game(self.win, self, overlay)
 
     def _init(self):
         # A board is created to for the game
@@ -21,11 +22,18 @@ class Game:
         self.turn = RED
         # Valid moves of selected piece
         self.valid_moves = {}
+        # Search results shared by the AI's moves during this game
+        self.tt = TranspositionTable()
+        self.mcts_tree = MCTSTree()
 
     def winner(self):
         # Returns the winner of the game
         return self.board.winner()
 
+    def is_draw(self):
+        # Drawn by repetition or the move-count rule, see Board.is_draw
+        return self.board.winner() is None and self.board.is_draw()
+
     def reset(self):
         # Reset Game
         self._init()
@@ -59,9 +67,8 @@ class Game:
         return True
 
     def draw_valid_moves(self, moves):
-        for move in moves:
-            row, col = move
-            pygame.draw.circle(self.win, BLUE, (col * SQUARE_SIZE + SQUARE_SIZE//2, row * SQUARE_SIZE + SQUARE_SIZE//2), 15)
+        from .drawing import draw_valid_moves
+        draw_valid_moves(self.win, moves)
 
     def change_turn(self):
         self.valid_moves = {}
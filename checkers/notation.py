@@ -0,0 +1,95 @@
+"""
+Text and binary forms of a position, for saving, loading and sending boards.
+
+The text form is the FEN tag of Portable Draughts Notation:
+
+    B:W21,22,23,K30:B1,2,K12
+
+the side to move, then the white and the black pieces by square number,
+kings marked with a K. Ranges such as B1-12 are read as well. PDN numbers
+the dark squares 1 to 32 starting from the back rank of the side that
+moves first. That side is Black in PDN and Red here, so B stands for Red
+and PDN square n is bitboard square 32 - n. The opening position is
+B:W21,...,32:B1,...,12.
+
+The binary form is a fixed 16 byte record of four little endian 32-bit
+words: the red, white and kings masks, then the side to move (0 Red,
+1 White) in the low byte with Board.quiet_plies above it. Both forms are
+immutable (str and bytes), so they work as dict keys and as payloads
+between processes. A position file is records back to back, which NumPy
+reads as numpy.fromfile(path, "<u4").reshape(-1, 4).
+"""
+import struct
+
+from .constants import RED, WHITE
+from .bitboard import Position, squares
+
+RECORD = struct.Struct("<IIII")
+
+def to_fen(position, turn):
+    """PDN FEN text of position with turn to move."""
+    def pieces(mask):
+        numbers = sorted(32 - sq for sq in squares(mask))
+        return ",".join(("K" if position.kings & (1 << (32 - n)) else "") + str(n) for n in numbers)
+    return f"{'B' if turn == RED else 'W'}:W{pieces(position.white)}:B{pieces(position.red)}"
+
+def from_fen(text):
+    """(position, turn) from PDN FEN text, with or without the [FEN "..."] tag around it."""
+    fen = text.strip()
+    if fen.startswith("[FEN"):
+        fen = fen[4:].strip().rstrip("]").strip().strip('"')
+    fen = fen.rstrip(".")
+    fields = fen.split(":")
+    if len(fields) != 3 or fields[0] not in ("B", "W"):
+        raise ValueError(f"not a FEN position: {text!r}")
+    turn = RED if fields[0] == "B" else WHITE
+    masks = {}
+    kings = 0
+    for field in fields[1:]:
+        color, entries = field[:1], field[1:]
+        if color not in ("B", "W") or color in masks:
+            raise ValueError(f"not a FEN position: {text!r}")
+        mask = 0
+        for entry in filter(None, entries.split(",")):
+            king = entry.startswith("K")
+            first, _, last = entry.lstrip("K").partition("-")
+            try:
+                numbers = range(int(first), int(last or first) + 1)
+            except ValueError:
+                raise ValueError(f"bad square {entry!r} in {text!r}") from None
+            if not numbers:
+                raise ValueError(f"reversed range {entry!r} in {text!r}")
+            for n in numbers:
+                if not 1 <= n <= 32:
+                    raise ValueError(f"square {n} out of range in {text!r}")
+                bit = 1 << (32 - n)
+                mask |= bit
+                if king:
+                    kings |= bit
+        masks[color] = mask
+    if masks["B"] & masks["W"]:
+        raise ValueError(f"squares with two pieces in {text!r}")
+    return Position(masks["B"], masks["W"], kings), turn
+
+def to_bytes(position, turn, quiet_plies=0):
+    """16 byte record of position with turn to move."""
+    return RECORD.pack(position.red, position.white, position.kings, (turn == WHITE) | quiet_plies << 8)
+
+def from_bytes(data, offset=0):
+    """(position, turn, quiet_plies) from a record, starting at offset in data."""
+    red, white, kings, state = RECORD.unpack_from(data, offset)
+    return Position(red, white, kings), (WHITE if state & 1 else RED), state >> 8
+
+def write_positions(path, entries):
+    """Write (board or position, turn) pairs to a position file."""
+    with open(path, "wb") as output:
+        for board, turn in entries:
+            output.write(to_bytes(getattr(board, "position", board), turn, getattr(board, "quiet_plies", 0)))
+
+def read_positions(path):
+    """Every (position, turn, quiet_plies) in a position file."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) % RECORD.size:
+        raise ValueError(f"{path} is not a whole number of {RECORD.size} byte records")
+    return [from_bytes(data, offset) for offset in range(0, len(data), RECORD.size)]
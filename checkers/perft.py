@@ -0,0 +1,89 @@
+"""
+Perft for the move generator: count the leaves of the move tree to a fixed
+depth from a handful of fixed positions.
+
+The counts pin down the move rules, so any change to the generator that
+alters a single move shows up as a different number. With --compare every
+node of the tree is also generated by the original traversal in
+checkers.reference and the two move lists (order included) must match.
+
+    python -m checkers.perft --depth 6 --compare
+"""
+import argparse
+import time
+
+from .constants import RED, WHITE
+from .bitboard import Position
+from .reference import reference_moves
+
+# (name, position, side to move)
+POSITIONS = [
+    ("start", Position.initial(), RED),
+    ("midgame", Position(0x9C105200, 0x000088B5, 0x00000000), WHITE),
+    ("red king", Position(0x58040020, 0x800A2E41, 0x80000000), RED),
+    ("kings", Position(0x00000250, 0x20200000, 0x20200240), RED),
+    ("endgame", Position(0x84080400, 0x20000010, 0x20000400), WHITE),
+]
+
+def generate(position, color):
+    return position.moves(color)
+
+def perft(position, color, depth, generator=generate):
+    if depth == 0:
+        return 1
+    nodes = 0
+    next_color = RED if color == WHITE else WHITE
+    for move in generator(position, color):
+        token = position.make_move(move)
+        nodes += perft(position, next_color, depth - 1, generator)
+        position.unmake_move(token)
+    return nodes
+
+def compare(position, color, depth, path=()):
+    """Move path to the first node where the generator and the reference disagree, or None."""
+    moves = position.moves(color)
+    if moves != reference_moves(position, color):
+        return path
+    if depth == 0:
+        return None
+    next_color = RED if color == WHITE else WHITE
+    for move in moves:
+        token = position.make_move(move)
+        mismatch = compare(position, next_color, depth - 1, path + (move,))
+        position.unmake_move(token)
+        if mismatch is not None:
+            return mismatch
+    return None
+
+def timed_perft(position, color, depth, generator=generate):
+    start = time.perf_counter()
+    nodes = perft(position.copy(), color, depth, generator)
+    return nodes, time.perf_counter() - start
+
+def main(depth, check):
+    failed = False
+    for name, position, color in POSITIONS:
+        print(f"{name}: {position!r}, {'RED' if color == RED else 'WHITE'} to move")
+        for d in range(1, depth + 1):
+            nodes, elapsed = timed_perft(position, color, d)
+            line = f"  depth {d}: {nodes:10d} nodes in {elapsed:7.3f}s"
+            if check:
+                reference_nodes, reference_elapsed = timed_perft(position, color, d, reference_moves)
+                line += f", reference {reference_elapsed:7.3f}s"
+                if reference_nodes != nodes:
+                    line += f" MISMATCH: reference counts {reference_nodes}"
+                    failed = True
+            print(line)
+        if check:
+            mismatch = compare(position.copy(), color, depth)
+            if mismatch is not None:
+                print(f"  move lists differ after {list(mismatch)}")
+                failed = True
+    return failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perft node counts for the move generator")
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--compare", action="store_true", help="check every node against checkers.reference")
+    args = parser.parse_args()
+    raise SystemExit(1 if main(args.depth, args.compare) else 0)
@@ -1,11 +1,6 @@
-from .constants import RED, WHITE, SQUARE_SIZE, GREY, CROWN
-import pygame
+from .constants import SQUARE_SIZE
 
 class Piece:
-    # Padding and outline scale with SQUARE_SIZE
-    PADDING = SQUARE_SIZE // 7  # Approx. 14 for SQUARE_SIZE=100, was 15
-    OUTLINE = SQUARE_SIZE // 35  # Approx. 3 for SQUARE_SIZE=100, was 2
-
     def __init__(self, row, col, color):
         self.row = row
         self.col = col
@@ -23,11 +18,8 @@ class Piece:
         self.king = True
     
     def draw(self, win):
-        radius = SQUARE_SIZE // 2 - self.PADDING
-        pygame.draw.circle(win, GREY, (self.x, self.y), radius + self.OUTLINE)
-        pygame.draw.circle(win, self.color, (self.x, self.y), radius)
-        if self.king:
-            win.blit(CROWN, (self.x - CROWN.get_width() // 2, self.y - CROWN.get_height() // 2))
+        from .drawing import draw_piece
+        draw_piece(win, self)
 
     def move(self, row, col):
         self.row = row
@@ -0,0 +1,109 @@
+"""
+The original move rules, kept as a reference for perft comparisons.
+
+This is Board.get_valid_moves with _traverse_left/_traverse_right as they
+were before the bitboard engine, run on a plain 8x8 grid built from a
+Position. It is slow on purpose: every step walks the grid exactly the way
+the original code did, so checkers.perft can check that the table driven
+generator in checkers.bitboard produces the same moves in the same order.
+"""
+from .constants import ROWS, COLS, RED, WHITE
+from .bitboard import square, row_col, squares
+
+def grid(position):
+    # 8x8 grid of (color, king) tuples, 0 for an empty square
+    board = [[0] * COLS for _ in range(ROWS)]
+    for color in (RED, WHITE):
+        for sq in squares(position.pieces(color)):
+            row, col = row_col(sq)
+            board[row][col] = (color, bool(position.kings & (1 << sq)))
+    return board
+
+def reference_moves(position, color):
+    """All moves for color as (source, destination, captured) square tuples."""
+    board = grid(position)
+    moves = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            if board[row][col] != 0 and board[row][col][0] == color:
+                for (r, c), skipped in get_valid_moves(board, row, col).items():
+                    captured = 0
+                    for skipped_row, skipped_col in skipped:
+                        captured |= 1 << square(skipped_row, skipped_col)
+                    moves.append((square(row, col), square(r, c), captured))
+    return moves
+
+def get_valid_moves(board, row, col):
+    moves = {}
+    color, king = board[row][col]
+    left = col - 1
+    right = col + 1
+
+    if color == RED or king:
+        moves.update(_traverse_left(board, row - 1, max(row - 3, -1), -1, color, left))
+        moves.update(_traverse_right(board, row - 1, max(row - 3, -1), -1, color, right))
+    if color == WHITE or king:
+        moves.update(_traverse_left(board, row + 1, min(row + 3, ROWS), 1, color, left))
+        moves.update(_traverse_right(board, row + 1, min(row + 3, ROWS), 1, color, right))
+
+    return moves
+
+def _traverse_left(board, start, stop, step, color, left, skipped=()):
+    moves = {}
+    last = []
+    for r in range(start, stop, step):
+        if left < 0:
+            break
+        current = board[r][left]
+        if current == 0:
+            if skipped and not last:
+                break
+            elif skipped:
+                moves[(r, left)] = last + list(skipped)
+            else:
+                moves[(r, left)] = last
+
+            if last:
+                if step == -1:
+                    row = max(r - 3, 0)
+                else:
+                    row = min(r + 3, ROWS)
+                moves.update(_traverse_left(board, r + step, row, step, color, left - 1, skipped=last))
+                moves.update(_traverse_right(board, r + step, row, step, color, left + 1, skipped=last))
+            break
+        elif current[0] == color:
+            break
+        else:
+            last = [(r, left)]
+        left -= 1
+    return moves
+
+def _traverse_right(board, start, stop, step, color, right, skipped=()):
+    moves = {}
+    last = []
+    for r in range(start, stop, step):
+        if right >= COLS:
+            break
+        current = board[r][right]
+        if current == 0:
+            if skipped and not last:
+                break
+            elif skipped:
+                moves[(r, right)] = last + list(skipped)
+            else:
+                moves[(r, right)] = last
+
+            if last:
+                if step == -1:
+                    row = max(r - 3, 0)
+                else:
+                    row = min(r + 3, ROWS)
+                moves.update(_traverse_left(board, r + step, row, step, color, right - 1, skipped=last))
+                moves.update(_traverse_right(board, r + step, row, step, color, right + 1, skipped=last))
+            break
+        elif current[0] == color:
+            break
+        else:
+            last = [(r, right)]
+        right += 1
+    return moves
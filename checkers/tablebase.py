@@ -0,0 +1,312 @@
+"""
+Endgame tablebase: the exact value of every position with only a few pieces.
+
+    python -m checkers.tablebase --pieces 3
+
+builds the table by retrograde analysis and writes checkers/endgame.tb.
+Searches pick the file up through load() when it exists and stop at every
+position it covers, instead of searching the endgame to a fixed depth.
+
+Positions are grouped into slices by material (red men, red kings, white
+men, white kings). Within a slice each kind of piece is a set of squares
+ranked in the combinatorial number system, so the index of a position is a
+few table lookups and positions themselves are never stored. Men never
+stand on their crowning row, which leaves them 28 squares; index values
+where two kinds would share a square are unused.
+
+Every index has one byte per side to move: 0 unused, 1 a draw, 2 + 2d a
+win for the side to move and 3 + 2d a loss, where the game ends d plies
+later with best play (the winner keeps it short, the loser long). The game
+is over when Position.winner() says so, just as in the searches.
+
+The file is a header, a list of slices and then the bytes of the slices.
+Probes read it through mmap, so nothing is loaded up front and worker
+processes that open the same file share the operating system's copy.
+"""
+import argparse
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections import defaultdict
+from itertools import combinations
+
+from .constants import RED, WHITE
+from .bitboard import Position, TOP_ROW, BOTTOM_ROW, popcount
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "endgame.tb")
+
+MAGIC = b"CKTB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")  # magic, version, pieces, number of slices
+SLICE = struct.Struct("<4BQQ")    # material, offset of the slice's bytes, positions in the slice
+
+# Results for the side to move
+WIN, DRAW, LOSS = 1, 0, -1
+WIN_SCORE = 10000  # Board.evaluate() score of a won position
+MAX_DISTANCE = 126
+
+COMB = [[0] * 33 for _ in range(33)]
+for n in range(33):
+    COMB[n][0] = 1
+    for k in range(1, n + 1):
+        COMB[n][k] = COMB[n - 1][k - 1] + COMB[n - 1][k]
+
+def rank(mask, offset):
+    # Rank of a set of squares among all sets of the same size, squares counted from offset
+    index = 0
+    k = 1
+    while mask:
+        bit = mask & -mask
+        index += COMB[bit.bit_length() - 1 - offset][k]
+        k += 1
+        mask ^= bit
+    return index
+
+def slice_size(material):
+    red_men, red_kings, white_men, white_kings = material
+    return COMB[28][red_men] * COMB[32][red_kings] * COMB[28][white_men] * COMB[32][white_kings]
+
+def materials(pieces):
+    # Every material with a piece on each side and at most pieces in all, fewest pieces first
+    for total in range(2, pieces + 1):
+        for red in range(1, total):
+            white = total - red
+            for red_kings in range(red + 1):
+                for white_kings in range(white + 1):
+                    yield red - red_kings, red_kings, white - white_kings, white_kings
+
+def layout(pieces):
+    # {material: (offset, size)}; a slice holds size bytes for Red to move, then size for White
+    slices = {}
+    offset = 0
+    for material in materials(pieces):
+        size = slice_size(material)
+        slices[material] = (offset, size)
+        offset += 2 * size
+    return slices
+
+def locate(slices, position, color):
+    """Offset of position's byte in the table, or None if the table doesn't cover it."""
+    red, white, kings = position.red, position.white, position.kings
+    red_men, red_kings, white_men, white_kings = red & ~kings, red & kings, white & ~kings, white & kings
+    if red_men & TOP_ROW or white_men & BOTTOM_ROW:
+        return None
+    material = (popcount(red_men), popcount(red_kings), popcount(white_men), popcount(white_kings))
+    entry = slices.get(material)
+    if entry is None:
+        return None
+    offset, size = entry
+    index = rank(red_men, 4)
+    index = index * COMB[32][material[1]] + rank(red_kings, 0)
+    index = index * COMB[28][material[2]] + rank(white_men, 0)
+    index = index * COMB[32][material[3]] + rank(white_kings, 0)
+    return offset + (size if color == WHITE else 0) + index
+
+def encode(result, distance):
+    if distance > MAX_DISTANCE:
+        raise ValueError(f"distance {distance} does not fit in a byte")
+    if result == DRAW:
+        return 1
+    return 2 + 2 * distance + (result == LOSS)
+
+def decode(value):
+    # (result, distance) for the side to move, None for an unused entry
+    if value == 0:
+        return None
+    if value == 1:
+        return DRAW, 0
+    return (WIN if value % 2 == 0 else LOSS), (value - 2) // 2
+
+def score(result, distance, color):
+    # Board.evaluate() scale: positive favors White, shorter wins score higher
+    if result == DRAW:
+        return 0
+    sign = 1 if (result == WIN) == (color == WHITE) else -1
+    return sign * (WIN_SCORE - distance)
+
+def placements(count, candidates, occupied):
+    # Masks of every way to put count pieces on the free squares among candidates
+    for chosen in combinations([sq for sq in candidates if not occupied & (1 << sq)], count):
+        mask = 0
+        for sq in chosen:
+            mask |= 1 << sq
+        yield mask
+
+def positions(material):
+    red_men, red_kings, white_men, white_kings = material
+    for rm in placements(red_men, range(4, 32), 0):
+        for rk in placements(red_kings, range(32), rm):
+            for wm in placements(white_men, range(28), rm | rk):
+                for wk in placements(white_kings, range(32), rm | rk | wm):
+                    yield Position(rm | rk, wm | wk, rk | wk)
+
+def lookup(data, slices, position, color):
+    # (result, distance) of a position with fewer pieces, already solved
+    if not position.red or not position.white:
+        return (WIN if position.winner() == color else LOSS), 0
+    return decode(data[locate(slices, position, color)])
+
+def solve(data, slices, group):
+    """
+    Fill in the slices in group, which all have the same number of pieces;
+    smaller slices must already be solved. Captures lead to those, every
+    other move stays in the group, so only moves inside the group need the
+    retrograde pass. That pass finalizes positions in order of distance:
+    a position is won as soon as one successor is lost, and lost once every
+    successor is won. Whatever is left after that is a draw.
+    """
+    total = sum(group[0][0])
+    low = group[0][1]
+    high = group[-1][1] + 2 * group[-1][2]
+    # Successors not yet known to be won, -1 once a position can no longer be lost
+    remaining = array("i", bytes(4 * (high - low)))
+    longest = array("h", bytes(2 * (high - low)))  # Longest win among the successors
+    predecessors = defaultdict(list)
+    pending = defaultdict(list)  # distance -> [(node, result)]
+    nodes = []
+
+    for material, _, _ in group:
+        for position in positions(material):
+            for color in (RED, WHITE):
+                node = locate(slices, position, color)
+                nodes.append(node)
+                winner = position.winner()
+                if winner is not None:
+                    pending[0].append((node, WIN if winner == color else LOSS))
+                    continue
+                opponent = RED if color == WHITE else WHITE
+                shortest_win = None
+                longest_loss = 0
+                unresolved = 0
+                can_lose = True
+                for move in position.moves(color):
+                    token = position.make_move(move)
+                    if popcount(position.red | position.white) == total:
+                        predecessors[locate(slices, position, opponent)].append(node)
+                        unresolved += 1
+                    else:
+                        result, distance = lookup(data, slices, position, opponent)
+                        if result == LOSS:
+                            if shortest_win is None or distance + 1 < shortest_win:
+                                shortest_win = distance + 1
+                        elif result == WIN:
+                            longest_loss = max(longest_loss, distance + 1)
+                        else:
+                            can_lose = False
+                    position.unmake_move(token)
+                if shortest_win is not None:
+                    pending[shortest_win].append((node, WIN))
+                    can_lose = False
+                remaining[node - low] = unresolved if can_lose else -1
+                longest[node - low] = longest_loss
+                if can_lose and not unresolved:
+                    pending[longest_loss].append((node, LOSS))
+
+    distance = 0
+    while pending:
+        for node, result in pending.pop(distance, ()):
+            if data[node]:
+                continue
+            data[node] = encode(result, distance)
+            for parent in predecessors.get(node, ()):
+                if data[parent]:
+                    continue
+                if result == LOSS:
+                    pending[distance + 1].append((parent, WIN))
+                    continue
+                i = parent - low
+                longest[i] = max(longest[i], distance + 1)
+                if remaining[i] > 0:
+                    remaining[i] -= 1
+                    if remaining[i] == 0:
+                        pending[longest[i]].append((parent, LOSS))
+        distance += 1
+
+    for node in nodes:
+        if not data[node]:
+            data[node] = encode(DRAW, 0)
+
+def generate(pieces, log=print):
+    """Solve every slice with at most pieces pieces; returns (slices, data)."""
+    slices = layout(pieces)
+    data = bytearray(sum(2 * size for _, size in slices.values()))
+    for total in range(2, pieces + 1):
+        start = time.perf_counter()
+        group = [(material, offset, size) for material, (offset, size) in slices.items() if sum(material) == total]
+        solve(data, slices, group)
+        values = data[group[0][1]:group[-1][1] + 2 * group[-1][2]]
+        wins = sum(values.count(value) for value in range(2, 256, 2))
+        draws = values.count(1)
+        losses = len(values) - values.count(0) - wins - draws
+        log(f"{total} pieces: {wins} wins, {losses} losses, {draws} draws "
+            f"in {time.perf_counter() - start:.1f}s")
+    return slices, data
+
+def write(path, pieces, slices, data):
+    with open(path, "wb") as output:
+        output.write(HEADER.pack(MAGIC, VERSION, pieces, len(slices)))
+        for material, (offset, size) in slices.items():
+            output.write(SLICE.pack(*material, offset, size))
+        output.write(data)
+
+class Tablebase:
+    """
+    A tablebase file opened through mmap. probe() and score() take a Board
+    or a Position and return None for positions the table doesn't cover.
+    """
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.pieces, count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+        self.slices = {}
+        for i in range(count):
+            *material, offset, size = SLICE.unpack_from(self.data, HEADER.size + i * SLICE.size)
+            self.slices[tuple(material)] = (offset, size)
+        self.start = HEADER.size + count * SLICE.size
+
+    def probe(self, board, color):
+        """(result, distance) for color to move: WIN, DRAW or LOSS and plies to the end of the game."""
+        position = getattr(board, "position", board)
+        if popcount(position.red | position.white) > self.pieces:
+            return None
+        node = locate(self.slices, position, color)
+        if node is None:
+            return None
+        return decode(self.data[self.start + node])
+
+    def score(self, board, color):
+        entry = self.probe(board, color)
+        if entry is None:
+            return None
+        return score(*entry, color)
+
+    def close(self):
+        self.data.close()
+
+_tables = {}
+
+def load(path=DEFAULT_PATH):
+    """The tablebase at path, opened once per process, or None if there is no such file."""
+    if path not in _tables:
+        _tables[path] = Tablebase(path) if os.path.exists(path) else None
+    return _tables[path]
+
+def probe_score(board, color):
+    # Score of board with color to move from the default tablebase, None on a miss
+    table = load()
+    if table is None:
+        return None
+    return table.score(board, color)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the endgame tablebase")
+    parser.add_argument("--pieces", type=int, default=3, help="largest number of pieces on the board")
+    parser.add_argument("--output", default=DEFAULT_PATH)
+    args = parser.parse_args()
+    slices, data = generate(args.pieces)
+    write(args.output, args.pieces, slices, data)
+    print(f"wrote {len(data)} entries to {args.output}")
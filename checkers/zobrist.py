@@ -0,0 +1,53 @@
+"""
+Zobrist keys for Board positions.
+
+Every (piece kind, square) pair gets a random 64-bit key and a position's
+hash is the XOR of the keys of its pieces, so a move only has to XOR out
+the squares it empties and XOR in the squares it fills. Side to move is
+not part of Board.hash; searches mix in WHITE_TO_MOVE themselves.
+"""
+import random
+
+from .bitboard import PROMOTION, squares
+
+RED_MAN, RED_KING, WHITE_MAN, WHITE_KING = range(4)
+
+# Fixed seed so hashes are stable between runs and processes
+_rng = random.Random(0x5EED)
+PIECE_KEYS = [[_rng.getrandbits(64) for _ in range(32)] for _ in range(4)]
+WHITE_TO_MOVE = _rng.getrandbits(64)
+
+
+def piece_kind(position, sq):
+    bit = 1 << sq
+    king = 1 if position.kings & bit else 0
+    if position.red & bit:
+        return RED_MAN + king
+    if position.white & bit:
+        return WHITE_MAN + king
+    return None
+
+
+def hash_position(position):
+    key = 0
+    for kind, mask in ((RED_MAN, position.red & ~position.kings),
+                       (RED_KING, position.red & position.kings),
+                       (WHITE_MAN, position.white & ~position.kings),
+                       (WHITE_KING, position.white & position.kings)):
+        for sq in squares(mask):
+            key ^= PIECE_KEYS[kind][sq]
+    return key
+
+
+def move_delta(position, move):
+    """XOR difference between the hash before and after move (call before applying it)."""
+    src, dst, captured = move
+    kind = piece_kind(position, src)
+    key = PIECE_KEYS[kind][src]
+    # Men landing on the first or last row are crowned
+    if kind in (RED_MAN, WHITE_MAN) and (1 << dst) & PROMOTION:
+        kind += 1
+    key ^= PIECE_KEYS[kind][dst]
+    for sq in squares(captured):
+        key ^= PIECE_KEYS[piece_kind(position, sq)][sq]
+    return key
@@ -1,5 +1,7 @@
 import pygame
 import os
+import logging
+from copy import deepcopy
 from checkers.constants import WIDTH, HEIGHT, SQUARE_SIZE, RED, WHITE, BLACK, GREEN
 from checkers.game import Game
 from algorithm.alpha_beta_pruning import alpha_beta_pruning
@@ -8,18 +10,32 @@ from algorithm.expectimax import expectimax
 from algorithm.iddfs import iddfs
 from algorithm.negamax import negamax
 from algorithm.mcts import mcts_move
+from algorithm.background import BackgroundSearch
+from algorithm.ponder import ponder
+from algorithm.opening_book import book_move
+from algorithm.parallel import parallel_alpha_beta, parallel_minimax, start_workers
+from algorithm.parallel_mcts import root_parallel_mcts, tree_parallel_mcts
 from player_stats import PlayerStats
 
-# Initialize Pygame
-pygame.init()
-pygame.font.init()
-
 FPS = 60
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption('Checkers')
+# Thinking time per move for the iterative deepening AI, in milliseconds
+IDDFS_TIME_LIMIT = 1000
+IDDFS_MAX_DEPTH = 64
+# Milliseconds MCTS thinks per move
+MCTS_TIME_LIMIT = 2000
+# Let the AI search the player's possible moves while they think
+PONDER = True
+# Play the first moves from the opening book (algorithm/opening_book.bin) without searching
+OPENING_BOOK = True
+# Worker processes for alpha-beta and minimax; 1 keeps the search in this process
+SEARCH_WORKERS = 1
+# Worker processes for MCTS and how they share the work: "root" (a tree each) or "tree" (one shared tree)
+MCTS_WORKERS = 1
+MCTS_PARALLEL = "root"
+# Log levels, e.g. CHECKERS_LOG=INFO or CHECKERS_LOG=WARNING,algorithm.mcts=DEBUG
+LOG_LEVELS = os.environ.get("CHECKERS_LOG", "WARNING")
 
-# Initialize player statistics
-player_stats = PlayerStats()
+logger = logging.getLogger("main")
 
 # Color definitions
 BG_COLOR = (240, 248, 255)  # Light Alice Blue
@@ -30,16 +46,45 @@ TEXT_NORMAL = (255, 255, 255)  # White
 TEXT_HOVER = (245, 245, 220)  # Beige
 TEXT_BLACK = (0, 0, 0)  # Black
 
-# Fonts
-FONT = pygame.font.Font(None, 36)
-HOVER_FONT = pygame.font.Font(None, 40)
-TITLE_FONT = pygame.font.Font(None, 48)
+# Window, fonts and player statistics, set by setup(). Worker processes of the
+# parallel searches import this module, so importing it must not open a window
+WIN = None
+FONT = HOVER_FONT = TITLE_FONT = None
+BACKGROUND_IMAGE = None
+player_stats = None
+
+def setup():
+    """Initialize Pygame, open the window and load the player statistics."""
+    global WIN, FONT, HOVER_FONT, TITLE_FONT, BACKGROUND_IMAGE, player_stats
+    pygame.init()
+    pygame.font.init()
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption('Checkers')
+
+    # Initialize player statistics
+    player_stats = PlayerStats()
 
-try:
-    BACKGROUND_IMAGE = pygame.image.load("background.jpg")
-    BACKGROUND_IMAGE = pygame.transform.scale(BACKGROUND_IMAGE, (WIDTH, HEIGHT))
-except:
-    BACKGROUND_IMAGE = None  # Fallback to solid color if image fails
+    # Fonts
+    FONT = pygame.font.Font(None, 36)
+    HOVER_FONT = pygame.font.Font(None, 40)
+    TITLE_FONT = pygame.font.Font(None, 48)
+
+    try:
+        BACKGROUND_IMAGE = pygame.image.load("background.jpg")
+        BACKGROUND_IMAGE = pygame.transform.scale(BACKGROUND_IMAGE, (WIDTH, HEIGHT))
+    except:
+        BACKGROUND_IMAGE = None  # Fallback to solid color if image fails
+
+def draw_thinking(progress):
+    """Overlay showing how far the AI's background search has got."""
+    if progress.depth:
+        message = f"Thinking... depth {progress.depth}, {progress.nodes} positions"
+    else:
+        message = f"Thinking... {progress.nodes} positions"
+    text = FONT.render(message, True, GREEN)
+    text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+    pygame.draw.rect(WIN, BLACK, text_rect.inflate(20, 10))
+    WIN.blit(text, text_rect)
 
 def get_row_col_from_mouse(pos):
     x, y = pos
@@ -225,11 +270,12 @@ def get_level_stats_text(level_num, level_name):
     level = str(level_num)
     wins = player_stats.stats["levels"][level]["wins"]
     losses = player_stats.stats["levels"][level]["losses"]
+    draws = player_stats.stats["levels"][level].get("draws", 0)
     total = wins + losses
     
-    if total > 0:
-        win_rate = (wins / total) * 100
-        return FONT.render(f"{level}. {level_name}: {wins}W/{losses}L ({win_rate:.1f}%)", True, TITLE_COLOR)
+    if total + draws > 0:
+        win_rate = (wins / total) * 100 if total > 0 else 0
+        return FONT.render(f"{level}. {level_name}: {wins}W/{draws}D/{losses}L ({win_rate:.1f}%)", True, TITLE_COLOR)
     else:
         return FONT.render(f"{level}. {level_name}: No games played", True, TITLE_COLOR)
 
@@ -283,7 +329,7 @@ def select_algorithm():
 def show_end_message(winner, level):
     """Display game over screen with winner information and update stats."""
     # Update player statistics based on the winner
-    player_won = winner == RED
+    player_won = None if winner is None else winner == RED  # None records a draw
     player_stats.update_stats(level, player_won)
     
     if BACKGROUND_IMAGE:
@@ -337,30 +383,103 @@ def show_end_message(winner, level):
             if event.type == pygame.KEYDOWN:
                 waiting = False
 
+def ai_search(ai_algorithm, game, tree=None):
+    """
+    The AI's search as a function of the board and a progress object.
+    MCTS keeps its tree in tree between moves when one is given.
+    """
+    if ai_algorithm == mcts_move and MCTS_WORKERS > 1 and MCTS_PARALLEL == "root":
+        return lambda board, progress: root_parallel_mcts(board, WHITE, None, workers=MCTS_WORKERS,
+                                                          progress=progress, time_limit=MCTS_TIME_LIMIT)
+    if ai_algorithm == mcts_move and MCTS_WORKERS > 1:
+        return lambda board, progress: tree_parallel_mcts(board, WHITE, None, workers=MCTS_WORKERS, progress=progress,
+                                                          time_limit=MCTS_TIME_LIMIT, tree=tree)
+    if ai_algorithm == mcts_move:  # Special case for MCTS
+        return lambda board, progress: mcts_move(board, WHITE, None, progress=progress,
+                                                 time_limit=MCTS_TIME_LIMIT, tree=tree)
+    if ai_algorithm == iddfs:  # Searches as deep as the time budget allows
+        return lambda board, progress: iddfs(board, IDDFS_MAX_DEPTH, WHITE, game,
+                                             time_limit=IDDFS_TIME_LIMIT, progress=progress)
+    if SEARCH_WORKERS > 1 and ai_algorithm in (alpha_beta_pruning, minimax):  # Root moves split over processes
+        parallel = parallel_alpha_beta if ai_algorithm == alpha_beta_pruning else parallel_minimax
+        return lambda board, progress: parallel(board, 3, WHITE, game, workers=SEARCH_WORKERS, progress=progress)
+    return lambda board, progress: ai_algorithm(board, 3, WHITE, game, progress=progress)
+
+def start_ai_search(ai_algorithm, game):
+    """Start the AI's search for the current position on a worker thread."""
+    return BackgroundSearch(ai_search(ai_algorithm, game, game.mcts_tree), game.get_board())
+
+def start_pondering(ai_algorithm, game, results):
+    """Search the AI's answer to each of the player's moves while they think."""
+    return BackgroundSearch(ponder, game.get_board(), RED, ai_search(ai_algorithm, game),
+                            tt=game.tt, results=results)
+
+def book_reply(ai_algorithm, game):
+    """The board after the AI's opening book move, or None once out of book."""
+    if not OPENING_BOOK or ai_algorithm == expectimax:  # Expectimax is meant to play loosely
+        return None
+    board = game.get_board()
+    move = book_move(board, WHITE)
+    if move is None:
+        return None
+    new_board = deepcopy(board)
+    new_board.make_move(move)
+    return new_board
+
+def apply_ai_result(ai_algorithm, game, result):
+    """Play the move a finished search came back with."""
+    if ai_algorithm == mcts_move:
+        if result:
+            piece, destination = result
+            game.select(piece.row, piece.col)
+            row, col = destination
+            game._move(row, col)
+    else:
+        value, new_board = result
+        game.ai_move(new_board)
+
+def game_over(game):
+    return game.winner() is not None or game.is_draw()
+
 def main():
     ai_algorithm, level = select_algorithm()  # Ask the user for AI choice
     run = True
     clock = pygame.time.Clock()
     game = Game(WIN)
+    # The AI thinks on a worker thread so the window keeps handling events
+    search = None
+    # Pondering runs during the player's turn; answers found so far by position hash
+    pondering = None
+    pondered = {}
 
     while run:
         clock.tick(FPS)
 
-        if game.turn == WHITE:
-            if ai_algorithm == mcts_move:  # Special case for MCTS
-                move = ai_algorithm(game.get_board(), WHITE)
-                if move:
-                    piece, destination = move
-                    game.select(piece.row, piece.col)
-                    row, col = destination
-                    game._move(row, col)
-            else:
-                value, new_board = ai_algorithm(game.get_board(), 3, WHITE, game)
-                game.ai_move(new_board)
-
-        if game.winner() is not None:
-            print(f"Winner: {game.winner()}")
-            show_end_message(game.winner(), level)
+        if game.turn == RED and PONDER and pondering is None and not game_over(game):
+            pondered = {}
+            pondering = start_pondering(ai_algorithm, game, pondered)
+
+        if game.turn == WHITE and not game_over(game):
+            if pondering is not None:
+                pondering.cancel()
+                pondering = None
+            if search is None:
+                result = pondered.pop(game.get_board().hash, None)
+                book_board = book_reply(ai_algorithm, game)
+                if book_board is not None:  # Still in the opening book, answer without searching
+                    game.ai_move(book_board)
+                elif result is not None:  # The player made a move the AI already searched
+                    apply_ai_result(ai_algorithm, game, result)
+                else:
+                    search = start_ai_search(ai_algorithm, game)
+                pondered = {}
+            elif search.done():
+                apply_ai_result(ai_algorithm, game, search.result)
+                search = None
+
+        if game_over(game):
+            logger.info("Winner: %s", game.winner() or "draw")
+            show_end_message(game.winner(), level)  # No winner means a draw
             run = False
 
         for event in pygame.event.get():
@@ -372,9 +491,39 @@ def main():
                 row, col = get_row_col_from_mouse(pos)
                 game.select(row, col)
 
-        game.update()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:  # Restart the game
+                if search is not None:
+                    search.cancel()
+                    search = None
+                if pondering is not None:
+                    pondering.cancel()
+                    pondering = None
+                game.reset()
+
+        if search is not None:
+            game.update(overlay=lambda: draw_thinking(search.progress))
+        else:
+            game.update()
 
+    if search is not None:
+        search.cancel()
+    if pondering is not None:
+        pondering.cancel()
     pygame.quit()
 
+def configure_logging(levels):
+    """Set log levels from "LEVEL" or "LEVEL,module=LEVEL,...", the bare level applying to everything else."""
+    logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+    for item in levels.split(","):
+        name, _, level = item.strip().rpartition("=")
+        logging.getLogger(name or None).setLevel(level.upper())
+
 if __name__ == "__main__":
+    configure_logging(LOG_LEVELS)
+    # Start the worker pools before Pygame so no worker is forked from a process running SDL
+    if SEARCH_WORKERS > 1:
+        start_workers(SEARCH_WORKERS)
+    if MCTS_WORKERS > 1:
+        start_workers(MCTS_WORKERS)
+    setup()
     main()
\ No newline at end of file
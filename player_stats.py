@@ -24,23 +24,27 @@ class PlayerStats:
             "player_name": "Player",
             "total_games": 0,
             "levels": {
-                "1": {"name": "Iterative Deepening DFS (Professional)", "wins": 0, "losses": 0, "last_played": None},
-                "2": {"name": "MonteCarlo (Challenging)", "wins": 0, "losses": 0, "last_played": None},
-                "3": {"name": "Alpha-Beta Pruning (Hard)", "wins": 0, "losses": 0, "last_played": None},
-                "4": {"name": "Minimax (Medium)", "wins": 0, "losses": 0, "last_played": None},
-                "5": {"name": "ExpectiMax (Easy)", "wins": 0, "losses": 0, "last_played": None},
-                "6": {"name": "Negamax (Beginner)", "wins": 0, "losses": 0, "last_played": None}
+                "1": {"name": "Iterative Deepening DFS (Professional)", "wins": 0, "losses": 0, "draws": 0, "last_played": None},
+                "2": {"name": "MonteCarlo (Challenging)", "wins": 0, "losses": 0, "draws": 0, "last_played": None},
+                "3": {"name": "Alpha-Beta Pruning (Hard)", "wins": 0, "losses": 0, "draws": 0, "last_played": None},
+                "4": {"name": "Minimax (Medium)", "wins": 0, "losses": 0, "draws": 0, "last_played": None},
+                "5": {"name": "ExpectiMax (Easy)", "wins": 0, "losses": 0, "draws": 0, "last_played": None},
+                "6": {"name": "Negamax (Beginner)", "wins": 0, "losses": 0, "draws": 0, "last_played": None}
             },
             "recommended_level": "4"  # Start with medium difficulty
         }
     
     def update_stats(self, level, won):
-        """Update statistics after a game"""
+        """Update statistics after a game; won is None for a draw"""
         level_str = str(level)
         self.stats["total_games"] += 1
         
         if level_str in self.stats["levels"]:
-            if won:
+            if won is None:
+                # Draws don't count towards the win rate; older files have no draws entry
+                level_stats = self.stats["levels"][level_str]
+                level_stats["draws"] = level_stats.get("draws", 0) + 1
+            elif won:
                 self.stats["levels"][level_str]["wins"] += 1
             else:
                 self.stats["levels"][level_str]["losses"] += 1
@@ -90,13 +94,14 @@ class PlayerStats:
     #gets the statistics used for recommending level to player
     def get_stats_summary(self):
         """Get a formatted summary of player statistics"""
+        summary = ""
         summary += f"Total Games: {self.stats['total_games']}\n\n"
         
         summary += "Performance by Level:\n"
         for level, data in self.stats["levels"].items():
             total = data["wins"] + data["losses"]
             win_rate = (data["wins"] / total * 100) if total > 0 else 0
-            summary += f"{level}. {data['name']}: {data['wins']}W/{data['losses']}L ({win_rate:.1f}%)\n"
+            summary += f"{level}. {data['name']}: {data['wins']}W/{data.get('draws', 0)}D/{data['losses']}L ({win_rate:.1f}%)\n"
         
         recommended = self.stats["recommended_level"]
         summary += f"\nRecommended Level: {recommended}. {self.stats['levels'][recommended]['name']}"
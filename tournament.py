@@ -0,0 +1,258 @@
+"""
+Headless engine-vs-engine tournament.
+
+Every pair of engines plays --games games with each colour, spread over a
+pool of worker processes:
+
+    python tournament.py --engines alpha_beta_pruning negamax mcts_move --games 50 \\
+        --depth negamax=4 --time mcts_move=500 --random-plies 4 --output results.jsonl
+
+Depth based engines search to --depth plies (3 by default, as in the game);
+iddfs and mcts_move get --time milliseconds per move instead. Each game
+starts with --random-plies random moves, and the two games of a pair with
+the same seed start from the same opening with colours swapped. Besides
+the draw rules of Board.is_draw, a game still going after --max-plies
+plies is a draw.
+
+Games are appended to the --output JSONL file as they finish. At the end
+the win/draw/loss matrix, Elo estimates and the average time per move of
+each engine are printed; --summarize prints the same for an existing file.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import permutations
+
+from checkers.bitboard import square
+from checkers.board import Board
+from checkers.constants import RED, WHITE
+from algorithm.alpha_beta_pruning import alpha_beta_pruning
+from algorithm.expectimax import expectimax
+from algorithm.iddfs import iddfs
+from algorithm.mcts import mcts_move
+from algorithm.minimax import minimax
+from algorithm.negamax import negamax
+from algorithm.transposition import TranspositionTable
+
+ENGINES = ["iddfs", "mcts_move", "alpha_beta_pruning", "minimax", "expectimax", "negamax"]
+TIMED_ENGINES = ("iddfs", "mcts_move")
+DEFAULT_DEPTH = 3
+DEFAULT_TIME = 1000  # Milliseconds per move for the timed engines
+IDDFS_MAX_DEPTH = 64
+MAX_PLIES = 200
+
+def find_move(board, color, new_board):
+    # The legal move that turns board into new_board
+    for move in board.legal_moves(color):
+        token = board.make_move(move)
+        found = board.position == new_board.position
+        board.unmake_move(token)
+        if found:
+            return move
+    return None
+
+def engine_move(engine, board, color, depth, time_limit, tt, rng):
+    """The engine's move for color as a (source, destination, captured) tuple, None if it has none."""
+    max_player = color == WHITE
+    if engine == "mcts_move":
+        result = mcts_move(board, color, None, seed=rng.getrandbits(32), time_limit=time_limit)
+        if result is None:
+            return None
+        piece, (row, col) = result
+        source, destination = square(piece.row, piece.col), square(row, col)
+        return next((move for move in board.legal_moves(color) if move[:2] == (source, destination)), None)
+    if engine == "iddfs":
+        new_board = iddfs(board, IDDFS_MAX_DEPTH, max_player, None, tt=tt, time_limit=time_limit)[1]
+    elif engine == "alpha_beta_pruning":
+        new_board = alpha_beta_pruning(board, depth, max_player, None, tt=tt)[1]
+    elif engine == "minimax":
+        new_board = minimax(board, depth, max_player, None, tt=tt)[1]
+    elif engine == "negamax":
+        new_board = negamax(board, depth, color, None, tt=tt)[1]
+    elif engine == "expectimax":
+        new_board = expectimax(board, depth, max_player, None)[1]
+    else:
+        raise ValueError(f"unknown engine {engine}")
+    return find_move(board, color, new_board)
+
+def play_game(task):
+    """Worker side: play one game and return its record."""
+    engines, settings, seed, random_plies, max_plies = task
+    rng = random.Random(seed)
+    random.seed(seed)  # Expectimax draws from the module level generator
+    board = Board()
+    turn = RED
+    opening = []
+    for _ in range(random_plies):
+        moves = board.legal_moves(turn)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        board.make_move(move)
+        opening.append(move)
+        turn = RED if turn == WHITE else WHITE
+
+    # Each side keeps its own table for the whole game, like Game.tt
+    tables = {RED: TranspositionTable(), WHITE: TranspositionTable()}
+    seconds = {RED: 0.0, WHITE: 0.0}
+    moves_made = {RED: 0, WHITE: 0}
+    rng = random.Random(seed)
+    plies = len(opening)
+    while board.winner() is None and not board.is_draw() and plies < max_plies:
+        engine = engines[turn]
+        depth, time_limit = settings[engine]
+        start = time.perf_counter()
+        move = engine_move(engine, board, turn, depth, time_limit, tables[turn], rng)
+        seconds[turn] += time.perf_counter() - start
+        moves_made[turn] += 1
+        if move is None:
+            break
+        board.make_move(move)
+        turn = RED if turn == WHITE else WHITE
+        plies += 1
+
+    winner = board.winner()
+    return {
+        "red": engines[RED],
+        "white": engines[WHITE],
+        "winner": "red" if winner == RED else "white" if winner == WHITE else None,
+        "plies": plies,
+        "seed": seed,
+        "opening": opening,
+        "red_moves": moves_made[RED],
+        "red_seconds": round(seconds[RED], 4),
+        "white_moves": moves_made[WHITE],
+        "white_seconds": round(seconds[WHITE], 4),
+    }
+
+def schedule(engines, games, seed):
+    # (red, white, seed) for every game; both colourings of a pair share each seed
+    tasks = []
+    for i in range(games):
+        for red, white in permutations(engines, 2):
+            tasks.append((red, white, seed + i))
+    return tasks
+
+def run(engines, games, settings, random_plies=4, max_plies=MAX_PLIES, workers=None, seed=0, output=None):
+    """Play the tournament and return the game records; each is written to output as it finishes."""
+    tasks = [({RED: red, WHITE: white}, settings, game_seed, random_plies, max_plies)
+             for red, white, game_seed in schedule(engines, games, seed)]
+    records = []
+    stream = open(output, "a") if output else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            for future in as_completed([executor.submit(play_game, task) for task in tasks]):
+                record = future.result()
+                records.append(record)
+                if stream is not None:
+                    stream.write(json.dumps(record) + "\n")
+                    stream.flush()
+                print(f"{len(records)}/{len(tasks)}: {record['red']} (red) vs {record['white']} (white): "
+                      f"{record['winner'] or 'draw'} after {record['plies']} plies")
+    finally:
+        if stream is not None:
+            stream.close()
+    return records
+
+def points(record, engine):
+    # 1 for a win, 0.5 for a draw, 0 for a loss, from engine's side
+    if record["winner"] is None:
+        return 0.5
+    return 1.0 if record[record["winner"]] == engine else 0.0
+
+def expected(rating, opponent):
+    return 1 / (1 + 10 ** ((opponent - rating) / 400))
+
+def elo(records, engines, rounds=100):
+    """
+    Maximum likelihood Elo ratings, averaging 1500. Each engine also gets
+    one draw against a 1500 opponent, so a perfect score stays finite.
+    """
+    ratings = dict.fromkeys(engines, 0.0)
+    for _ in range(rounds):
+        for engine in engines:
+            score = 0.5
+            expected_score = expected(ratings[engine], 0.0)
+            slope = expected_score * (1 - expected_score)
+            for record in records:
+                if engine not in (record["red"], record["white"]) or record["red"] == record["white"]:
+                    continue
+                opponent = record["white"] if record["red"] == engine else record["red"]
+                e = expected(ratings[engine], ratings[opponent])
+                score += points(record, engine)
+                expected_score += e
+                slope += e * (1 - e)
+            # Newton step on the log likelihood
+            ratings[engine] += (score - expected_score) / (slope * math.log(10) / 400)
+    mean = sum(ratings.values()) / len(ratings)
+    return {engine: 1500 + rating - mean for engine, rating in ratings.items()}
+
+def summarize(records):
+    engines = sorted({record["red"] for record in records} | {record["white"] for record in records})
+    width = max(len(engine) for engine in engines)
+    print("\nWins-draws-losses of the row engine against the column engine")
+    print(" " * width + "".join(f"  {engine[:12]:>12}" for engine in engines))
+    for engine in engines:
+        cells = []
+        for opponent in engines:
+            games = [record for record in records if {record["red"], record["white"]} == {engine, opponent}
+                     and engine != opponent]
+            scores = [points(record, engine) for record in games]
+            cells.append(f"{scores.count(1.0)}-{scores.count(0.5)}-{scores.count(0.0)}" if games else "-")
+        print(f"{engine:>{width}}" + "".join(f"  {cell:>12}" for cell in cells))
+
+    ratings = elo(records, engines)
+    print(f"\n{'engine':>{width}}  {'elo':>6}  {'games':>6}  {'score':>6}  {'ms/move':>8}")
+    for engine in sorted(engines, key=ratings.get, reverse=True):
+        games = [record for record in records if engine in (record["red"], record["white"])]
+        score = sum(points(record, engine) for record in games)
+        moves = sum(record[f"{color}_moves"] for record in games for color in ("red", "white")
+                    if record[color] == engine)
+        seconds = sum(record[f"{color}_seconds"] for record in games for color in ("red", "white")
+                      if record[color] == engine)
+        latency = 1000 * seconds / moves if moves else 0.0
+        print(f"{engine:>{width}}  {ratings[engine]:6.0f}  {len(games):6d}  {score:6.1f}  {latency:8.1f}")
+
+def parse_settings(values, kind, engines):
+    # "engine=value" pairs, or a bare value for every engine
+    settings = {}
+    for value in values or ():
+        engine, _, number = value.rpartition("=")
+        for name in ([engine] if engine else engines):
+            settings[name] = kind(number)
+    return settings
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine-vs-engine checkers tournament")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=["alpha_beta_pruning", "negamax", "minimax"])
+    parser.add_argument("--games", type=int, default=10, help="games per pair of engines and colouring")
+    parser.add_argument("--depth", nargs="*", help=f"search depth, e.g. 4 or negamax=4 (default {DEFAULT_DEPTH})")
+    parser.add_argument("--time", nargs="*", help=f"ms per move for {', '.join(TIMED_ENGINES)} (default {DEFAULT_TIME})")
+    parser.add_argument("--random-plies", type=int, default=4, help="random moves at the start of every game")
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES, help="plies after which a game is a draw")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSONL file the games are appended to")
+    parser.add_argument("--summarize", metavar="JSONL", help="only print the summary of an earlier run")
+    args = parser.parse_args()
+
+    if args.summarize:
+        with open(args.summarize) as results:
+            summarize([json.loads(line) for line in results if line.strip()])
+        return
+    if len(args.engines) < 2:
+        parser.error("a tournament needs at least two engines")
+    depths = parse_settings(args.depth, int, args.engines)
+    times = parse_settings(args.time, float, args.engines)
+    settings = {engine: (depths.get(engine, DEFAULT_DEPTH), times.get(engine, DEFAULT_TIME))
+                for engine in args.engines}
+    records = run(args.engines, args.games, settings, args.random_plies, args.max_plies,
+                  args.workers, args.seed, args.output)
+    summarize(records)
+
+if __name__ == "__main__":
+    main()